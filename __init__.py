@@ -1,26 +1,66 @@
+import sys
 import importlib
 
+import bpy
 
+
+# NOTE: Registration order matters, `preferences` owns the
+# property groups that `operators` and `ui` rely on.
+#
+# Heavy dependencies (NumPy and anything built on it) are imported
+# where they are first used rather than at module level, so that
+# enabling the add-on only pays for class registration
 module_names = (
-    "ui",
+    "preferences",
+    "outliner",
     "operators",
-    "preferences"
+    "ui"
+)
+
+# Modules that only make sense with an interface, these
+# are never imported in background (headless) sessions
+ui_module_names = (
+    "ui",
 )
 
 modules = []
-for module_name in module_names:
-    if module_name in locals():
-        modules.append(importlib.reload(locals()[module_name]))
-    else:
-        modules.append(importlib.import_module(f".{module_name}", __package__))
+
+
+def get_module_names() -> tuple:
+    """Get the sub-modules needed by the current session."""
+    if not bpy.app.background:
+        return module_names
+    return tuple(
+        name for name in module_names if name not in ui_module_names
+    )
+
+
+def load_modules() -> list:
+    """Import sub-modules on demand, reloading any already loaded.
+
+    Deferred until registration so that merely importing
+    the package stays cheap."""
+    loaded_modules = []
+    for module_name in get_module_names():
+        module = sys.modules.get(f"{__package__}.{module_name}")
+        if module is not None:
+            loaded_modules.append(importlib.reload(module))
+        else:
+            loaded_modules.append(
+                importlib.import_module(f".{module_name}", __package__)
+            )
+    return loaded_modules
+
 
 def register():
+    modules[:] = load_modules()
     for mod in modules:
         mod.register()
 
 def unregister():
-    for mod in modules:
+    for mod in reversed(modules):
         mod.unregister()
+    modules.clear()
 
 
 # ##### BEGIN GPL LICENSE BLOCK #####
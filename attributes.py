@@ -0,0 +1,201 @@
+"""Bulk (NumPy) access to mesh color attributes.
+
+Everything here reads & writes whole attribute buffers
+through `foreach_get`/`foreach_set`, so it must run while
+the mesh data is current, i.e. outside of Edit Mode.
+"""
+
+
+import numpy as np
+
+from bpy.types import Mesh, Attribute
+
+from .colorspace import (
+    srgb_to_linear,
+    linear_to_srgb,
+    byte_srgb_to_linear
+)
+
+
+def get_domain_size(data: Mesh, domain: str) -> int:
+    """Get the element count of a color attribute domain."""
+    if domain == 'POINT':
+        return len(data.vertices)
+    return len(data.loops)
+
+
+def get_loop_vertex_indices(data: Mesh) -> np.ndarray:
+    """Get the vertex index of every face corner (loop)."""
+    loop_vertex_indices = np.empty(len(data.loops), dtype=np.int32)
+    data.loops.foreach_get("vertex_index", loop_vertex_indices)
+    return loop_vertex_indices
+
+
+def tile_color(color, count: int) -> np.ndarray:
+    """Build a `(count, 4)` buffer filled with a single color."""
+    return np.tile(np.asarray(color, dtype=np.float32), (count, 1))
+
+
+def read_colors(attribute: Attribute, srgb: bool=True) -> np.ndarray:
+    """Read a color attribute into a `(n, 4)` float array.
+
+    Values are in sRGB (matching the `COLOR_GAMMA` properties)
+    unless `srgb` is disabled, then linear values are returned."""
+    colors = np.empty(len(attribute.data) * 4, dtype=np.float32)
+    if attribute.data_type == 'BYTE_COLOR':
+        # NOTE: Byte colors are stored as sRGB, read as-is
+        attribute.data.foreach_get("color_srgb", colors)
+        colors = colors.reshape(-1, 4)
+        if not srgb:
+            colors = byte_srgb_to_linear(colors)
+        return colors
+
+    attribute.data.foreach_get("color", colors)
+    colors = colors.reshape(-1, 4)
+    if srgb:
+        colors = linear_to_srgb(colors)
+    return colors
+
+
+def write_colors(
+        attribute: Attribute, colors: np.ndarray, srgb: bool=True
+    ) -> None:
+    """Write a `(n, 4)` float array to a color attribute."""
+    if attribute.data_type == 'BYTE_COLOR':
+        if not srgb:
+            colors = linear_to_srgb(colors)
+        prop = "color_srgb"
+    else:
+        if srgb:
+            colors = srgb_to_linear(colors)
+        prop = "color"
+    colors = np.ascontiguousarray(colors, dtype=np.float32).ravel()
+    attribute.data.foreach_set(prop, colors)
+
+
+def corner_to_point(
+        colors: np.ndarray, loop_vertex_indices: np.ndarray, vert_count: int
+    ) -> np.ndarray:
+    """Average face corner colors into per-vertex colors.
+
+    Loose vertices (no face corners) are left white."""
+    counts = np.bincount(loop_vertex_indices, minlength=vert_count)
+    points = np.empty((vert_count, 4), dtype=np.float32)
+    for channel in range(4):
+        points[:, channel] = np.bincount(
+            loop_vertex_indices,
+            weights=colors[:, channel],
+            minlength=vert_count
+        )
+    used = counts > 0
+    points[used] /= counts[used, None]
+    points[~used] = 1
+    return points
+
+
+def point_to_corner(
+        colors: np.ndarray, loop_vertex_indices: np.ndarray
+    ) -> np.ndarray:
+    """Expand per-vertex colors to every face corner."""
+    return colors[loop_vertex_indices]
+
+
+def get_color_index(data: Mesh, name: str) -> int:
+    """Get the index of a color attribute by name, -1 if missing."""
+    for idx, attribute in enumerate(data.color_attributes):
+        if attribute.name == name:
+            return idx
+    return -1
+
+
+def get_color_name(data: Mesh, idx: int) -> str | None:
+    """Get the name of a color attribute by index."""
+    if idx < 0:
+        return None
+    try:
+        return data.color_attributes[idx].name
+    except IndexError:
+        return None
+
+
+def get_sync_signature(data: Mesh) -> tuple | None:
+    """Get a cheap signature of the active color attribute.
+
+    Used to tell if a mesh already conforms to another when syncing,
+    made of the name, domain, type & render status of the active color."""
+    color_attributes = data.color_attributes
+    idx = color_attributes.active_color_index
+    if idx < 0:
+        return None
+    try:
+        attribute = color_attributes[idx]
+    except IndexError:
+        return None
+    return (
+        attribute.name, attribute.domain, attribute.data_type,
+        color_attributes.render_color_index == idx
+    )
+
+
+def convert_color_attribute(
+        data: Mesh, attribute: Attribute, domain: str, data_type: str
+    ) -> Attribute:
+    """Convert a color attribute to another domain and/or data type.
+
+    The attribute is rebuilt under the same name and keeps
+    its active & render status."""
+    if attribute.domain == domain and attribute.data_type == data_type:
+        return attribute
+
+    color_attributes = data.color_attributes
+    name = attribute.name
+    active_name = get_color_name(data, color_attributes.active_color_index)
+    render_name = get_color_name(data, color_attributes.render_color_index)
+
+    # NOTE: Linear values, so averaging & type changes are lossless
+    colors = read_colors(attribute, srgb=False)
+    if attribute.domain != domain:
+        loop_vertex_indices = get_loop_vertex_indices(data)
+        if domain == 'POINT':
+            colors = corner_to_point(
+                colors, loop_vertex_indices, len(data.vertices)
+            )
+        else: # Corner
+            colors = point_to_corner(colors, loop_vertex_indices)
+
+    color_attributes.remove(attribute)
+    attribute = color_attributes.new(name, type=data_type, domain=domain)
+    write_colors(attribute, colors, srgb=False)
+
+    # NOTE: Blender may have renamed the new attribute (e.g.
+    # a non-color attribute already uses the name)
+    if active_name == name:
+        active_name = attribute.name
+    if render_name == name:
+        render_name = attribute.name
+    active_idx = get_color_index(data, active_name or "")
+    if active_idx >= 0:
+        color_attributes.active_color_index = active_idx
+    render_idx = get_color_index(data, render_name or "")
+    if render_idx >= 0:
+        color_attributes.render_color_index = render_idx
+    return attribute
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
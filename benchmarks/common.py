@@ -0,0 +1,22 @@
+"""Helpers shared by the benchmark scripts.
+
+Scripts run through `blender --python`, so they add this
+directory to `sys.path` before importing it.
+"""
+
+
+import sys
+import time
+
+
+def get_module_name() -> str:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if not argv:
+        raise SystemExit("Pass the add-on module name after `--`")
+    return argv[0]
+
+
+def time_call(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
@@ -0,0 +1,79 @@
+"""Time Smooth & Hard selection fills on meshes with high-valence poles.
+
+Run from a shell, passing the add-on module name after `--`:
+
+    blender --background --factory-startup --python benchmarks/interpolation.py \
+        -- bl_ext.user_default.VertexColorsPlus
+
+Each mesh is a triangle fan (one pole of the given valence) arrayed
+until it has roughly `CORNER_TARGET` corners, so fill cost can be
+compared across valences at a fixed mesh size.
+"""
+
+
+import os
+import sys
+from statistics import median
+
+import bpy
+import addon_utils
+
+sys.path.insert(0, os.path.dirname(__file__))
+from common import get_module_name, time_call # pylint: disable=C0413
+
+
+RUNS = 10
+CORNER_TARGET = 1_000_000
+VALENCES = (4, 16, 64, 256, 1024, 4096)
+
+
+def build_pole_mesh(valence: int) -> bpy.types.Object:
+    """Build a mesh of arrayed triangle fans, each with one pole."""
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.ops.mesh.primitive_circle_add(vertices=valence, fill_type='TRIFAN')
+    ob = bpy.context.object
+
+    # NOTE: A fan has `valence * 3` corners
+    array = ob.modifiers.new("Array", 'ARRAY')
+    array.count = max(1, CORNER_TARGET // (valence * 3))
+    bpy.ops.object.modifier_apply(modifier=array.name)
+    return ob
+
+
+def main():
+    module_name = get_module_name()
+    bpy.ops.preferences.addon_refresh()
+    addon_utils.enable(module_name)
+
+    # NOTE: Only time the fill itself
+    preferences = bpy.context.preferences.addons[module_name].preferences
+    preferences.auto_palette_refresh = False
+
+    color_plus = bpy.context.scene.color_plus
+    print(f"Vertex Colors Plus selection fills ({RUNS} runs)")
+    for valence in VALENCES:
+        ob = build_pole_mesh(valence)
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+
+        for interp_type in ('smooth', 'hard'):
+            color_plus.interp_type = interp_type
+            times = [
+                time_call(bpy.ops.color_plus.edit_color, edit_type='apply')
+                for _ in range(RUNS)
+            ]
+            print(
+                f"  valence {valence:<5} {interp_type:<7}"
+                f"  corners {len(ob.data.loops):>8}"
+                f"  min {min(times) * 1000:8.2f} ms"
+                f"  median {median(times) * 1000:8.2f} ms"
+            )
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        bpy.data.objects.remove(ob)
+
+    addon_utils.disable(module_name)
+
+
+if __name__ == "__main__":
+    main()
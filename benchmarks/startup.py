@@ -0,0 +1,52 @@
+"""Time how long enabling & disabling the add-on takes.
+
+Run from a shell, passing the add-on module name after `--`:
+
+    blender --background --factory-startup --python benchmarks/startup.py \
+        -- bl_ext.user_default.VertexColorsPlus
+
+Drop `--background` to time the interactive path (keymaps, UI classes).
+"""
+
+
+import os
+import sys
+from statistics import median
+
+import bpy
+import addon_utils
+
+sys.path.insert(0, os.path.dirname(__file__))
+from common import get_module_name, time_call # pylint: disable=C0413
+
+
+RUNS = 20
+
+
+def main():
+    module_name = get_module_name()
+    bpy.ops.preferences.addon_refresh()
+
+    enable_times = []
+    disable_times = []
+    for _ in range(RUNS):
+        enable_times.append(
+            time_call(addon_utils.enable, module_name)
+        )
+        disable_times.append(
+            time_call(addon_utils.disable, module_name)
+        )
+
+    mode = "background" if bpy.app.background else "interactive"
+    print(f"Vertex Colors Plus startup ({mode}, {RUNS} runs)")
+    print(f"  cold     {enable_times[0] * 1000:7.2f} ms")
+    for label, times in (("enable", enable_times),
+                         ("disable", disable_times)):
+        print(
+            f"  {label:<8} min {min(times) * 1000:7.2f} ms"
+            f"  median {median(times) * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Vectorized color blend modes.
+
+Colors are `(n, 4)` float arrays in sRGB, the
+same space as the `COLOR_GAMMA` properties.
+"""
+
+
+import numpy as np
+
+
+def blend_colors(
+        base: np.ndarray, color, blend_mode: str='REPLACE',
+        opacity: float=1.0, channels=(True, True, True, True),
+        blend_alpha: bool=False
+    ) -> np.ndarray:
+    """Blend a color over an array of existing colors.
+
+    Only the given RGBA `channels` are changed, the result is clamped.
+    Like Blender's color blend modes, only Replace changes the alpha
+    of the base colors unless `blend_alpha` is set."""
+    color = np.asarray(color, dtype=np.float32)
+    if blend_mode != 'REPLACE' and not blend_alpha:
+        channels = tuple(channels[:3]) + (False,)
+    if blend_mode == 'MULTIPLY':
+        blended = base * color
+    elif blend_mode == 'ADD':
+        blended = base + color
+    elif blend_mode == 'SUBTRACT':
+        blended = base - color
+    elif blend_mode == 'SCREEN':
+        blended = 1 - (1 - base) * (1 - color)
+    elif blend_mode == 'OVERLAY':
+        blended = np.where(
+            base <= .5,
+            2 * base * color,
+            1 - 2 * (1 - base) * (1 - color)
+        )
+    else: # Replace
+        blended = np.broadcast_to(color, base.shape)
+
+    if opacity < 1:
+        blended = base + (blended - base) * opacity
+    blended = np.where(np.asarray(channels), blended, base)
+    return np.clip(blended, 0, 1).astype(np.float32)
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
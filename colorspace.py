@@ -0,0 +1,132 @@
+"""Precomputed lookup tables for sRGB/linear & byte/float conversions.
+
+Every vectorized color path goes through these so conversions are
+array lookups, and values always match what the viewport shows.
+"""
+
+
+import numpy as np
+
+
+LUT_SIZE = 4096
+
+
+def srgb_to_linear_exact(values: np.ndarray) -> np.ndarray:
+    return np.where(
+        values <= .04045,
+        values / 12.92,
+        ((np.maximum(values, .04045) + .055) / 1.055) ** 2.4
+    )
+
+
+def linear_to_srgb_exact(values: np.ndarray) -> np.ndarray:
+    return np.where(
+        values <= .0031308,
+        values * 12.92,
+        1.055 * np.maximum(values, .0031308) ** (1 / 2.4) - .055
+    )
+
+
+LUT_INPUT = np.linspace(0, 1, LUT_SIZE, dtype=np.float64)
+SRGB_TO_LINEAR = srgb_to_linear_exact(LUT_INPUT).astype(np.float32)
+LINEAR_TO_SRGB = linear_to_srgb_exact(LUT_INPUT).astype(np.float32)
+
+BYTE_TO_FLOAT = (np.arange(256, dtype=np.float64) / 255).astype(np.float32)
+BYTE_SRGB_TO_LINEAR = srgb_to_linear_exact(
+    BYTE_TO_FLOAT.astype(np.float64)
+).astype(np.float32)
+
+
+def lookup(values: np.ndarray, lut: np.ndarray, exact) -> np.ndarray:
+    """Convert values in the 0-1 range through an interpolated LUT.
+
+    Values outside of the range (e.g. HDR floats) use the exact curve."""
+    position = np.clip(values, 0, 1) * (LUT_SIZE - 1)
+    idx = np.minimum(position.astype(np.int32), LUT_SIZE - 2)
+    factor = position - idx
+    lower = lut[idx]
+    converted = lower + (lut[idx + 1] - lower) * factor
+
+    out_of_range = (values < 0) | (values > 1)
+    if out_of_range.any():
+        converted[out_of_range] = exact(values[out_of_range])
+    return converted.astype(np.float32)
+
+
+def srgb_to_linear(colors: np.ndarray) -> np.ndarray:
+    """Convert `(n, 4)` sRGB colors to linear, alpha is untouched."""
+    converted = np.array(colors, dtype=np.float32)
+    converted[..., :3] = lookup(
+        converted[..., :3], SRGB_TO_LINEAR, srgb_to_linear_exact
+    )
+    return converted
+
+
+def linear_to_srgb(colors: np.ndarray) -> np.ndarray:
+    """Convert `(n, 4)` linear colors to sRGB, alpha is untouched."""
+    converted = np.array(colors, dtype=np.float32)
+    converted[..., :3] = lookup(
+        converted[..., :3], LINEAR_TO_SRGB, linear_to_srgb_exact
+    )
+    return converted
+
+
+def float_to_byte(values: np.ndarray) -> np.ndarray:
+    """Quantize 0-1 floats to 8-bit values."""
+    return np.rint(np.clip(values, 0, 1) * 255).astype(np.uint8)
+
+
+def byte_to_float(values: np.ndarray) -> np.ndarray:
+    """Expand 8-bit values to 0-1 floats."""
+    return BYTE_TO_FLOAT[values]
+
+
+def byte_srgb_to_linear(colors: np.ndarray) -> np.ndarray:
+    """Convert 8-bit stepped `(n, 4)` sRGB colors to linear."""
+    channels = float_to_byte(colors)
+    converted = np.empty(channels.shape, dtype=np.float32)
+    converted[..., :3] = BYTE_SRGB_TO_LINEAR[channels[..., :3]]
+    converted[..., 3] = BYTE_TO_FLOAT[channels[..., 3]]
+    return converted
+
+
+def quantize_byte(colors: np.ndarray) -> np.ndarray:
+    """Snap colors to the 8-bit steps a `BYTE_COLOR` attribute stores."""
+    return byte_to_float(float_to_byte(colors))
+
+
+def color_keys(colors: np.ndarray) -> np.ndarray:
+    """Pack `(n, 4)` colors into one 32-bit RGBA8 key per color.
+
+    Keys are used to histogram, match & look up colors."""
+    channels = float_to_byte(colors).astype(np.uint32)
+    return (channels[..., 0] << 24) | (channels[..., 1] << 16) \
+         | (channels[..., 2] << 8) | channels[..., 3]
+
+
+def key_colors(keys: np.ndarray) -> np.ndarray:
+    """Unpack 32-bit RGBA8 keys back into `(n, 4)` colors."""
+    keys = np.asarray(keys, dtype=np.uint32)
+    channels = np.stack(
+        (keys >> 24, keys >> 16, keys >> 8, keys), axis=-1
+    ) & 0xFF
+    return byte_to_float(channels.astype(np.uint8))
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -2,6 +2,22 @@
 BLANK_ARRAY = (1, 1, 1, 1)
 MAX_OUTLINER_ITEM_MSG = "Max # of colors in outliner"
 
+BLEND_MODE_ITEMS = (
+    ('REPLACE', "Replace", "Overwrite the existing color"),
+    ('MULTIPLY', "Multiply", "Multiply the existing color"),
+    ('ADD', "Add", "Add to the existing color"),
+    ('SUBTRACT', "Subtract", "Subtract from the existing color"),
+    ('OVERLAY', "Overlay", "Multiply dark & screen light existing colors"),
+    ('SCREEN', "Screen", "Inverse multiply, lightens the existing color")
+)
+
+DEFAULT_CUSTOM_PALETTE = (
+    (1, 0, 0, 1), (0, 1, 0, 1), (0, 0, 1, 1), (.75, .75, .75, 1),
+    (.75, .75, 0, 1), (0, .75, .75, 1), (.75, 0, .75, 1), (.5, .5, .5, 1),
+    (.5, .75, 0, 1), (0, .5, .75, 1), (.75, 0, .5, 1), (.25, .25, .25, 1),
+    (.25, .5, 0, 1), (0, .5, .25, 1), (.25, 0, .5, 1), (0, 0, 0, 1)
+)
+
 
 # ##### BEGIN GPL LICENSE BLOCK #####
 #
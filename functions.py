@@ -1,8 +1,11 @@
 from typing import Iterable
 
-from bpy.types import Mesh, Attribute
+from bpy.types import Mesh, Attribute, Context
 from bmesh.types import BMesh, BMLayerItem, BMLoop, BMVert
 
+from .constants import BLANK_ARRAY
+from .palette_io import PaletteData
+
 
 def iterable_to_list(iterable: Iterable) -> list:
     """Convert 4-size iterable to a plain list."""
@@ -11,6 +14,14 @@ def iterable_to_list(iterable: Iterable) -> list:
     return converted_list
 
 
+def get_selected_meshes(context: Context) -> list[Mesh]:
+    """Get the unique mesh data of all selected mesh objects.
+
+    Meshes shared between objects are only returned once."""
+    meshes = (ob.data for ob in context.selected_objects if ob.type == 'MESH')
+    return list(dict.fromkeys(meshes))
+
+
 def public_color_exists(data: Mesh) -> bool:
     """Check if any public color attributes exist.
 
@@ -26,22 +37,47 @@ def public_color_exists(data: Mesh) -> bool:
     return True
 
 
-def create_color(data: Mesh, name: str="Attribute") -> Attribute:
-    """Create color attribute from object mode."""
-    color_attributes = data.color_attributes
-    attribute = color_attributes.new(
-        name, type='BYTE_COLOR', domain='CORNER'
+def create_color(
+        data: Mesh, name: str="Attribute", fill: Iterable=BLANK_ARRAY,
+        domain: str='CORNER', data_type: str='BYTE_COLOR'
+    ) -> Attribute:
+    """Create a color attribute filled with a single color from object mode.
+
+    The new attribute becomes the active & render color."""
+    return create_colors((data,), name, fill, domain, data_type)[0]
+
+
+def create_colors(
+        meshes: Iterable[Mesh], name: str="Attribute",
+        fill: Iterable=BLANK_ARRAY, domain: str='CORNER',
+        data_type: str='BYTE_COLOR', set_active: bool=True
+    ) -> list[Attribute]:
+    """Create the same filled color attribute on many meshes from object mode.
+
+    One fill buffer is built for the largest domain and
+    sliced per mesh, so each mesh costs a single `foreach_set`."""
+    from .attributes import (
+        get_domain_size,
+        get_color_index,
+        tile_color,
+        write_colors
     )
-    color_attributes.active_color_index = \
-    color_attributes.render_color_index = len(color_attributes)-1
-    for idx in range(len(data.vertices)):
-        attribute.data[idx].color = [1, 1, 1, 1]
-    # NOTE: Alternatively, using foreach_set
-    #cols = []
-    #for idx in range(len(data.vertices)):
-    #   cols += [1, 1, 1, 1]
-    #attribute.data.foreach_set("color", cols)
-    return attribute
+
+    meshes = list(meshes)
+    sizes = [get_domain_size(data, domain) for data in meshes]
+    fill_buffer = tile_color(fill, max(sizes, default=0))
+
+    attributes = []
+    for data, size in zip(meshes, sizes):
+        color_attributes = data.color_attributes
+        attribute = color_attributes.new(name, type=data_type, domain=domain)
+        write_colors(attribute, fill_buffer[:size])
+        if set_active:
+            color_attributes.active_color_index = \
+            color_attributes.render_color_index = \
+                get_color_index(data, attribute.name)
+        attributes.append(attribute)
+    return attributes
 
 
 def get_active_color(data: Mesh) -> Attribute | None:
@@ -90,23 +126,15 @@ def get_bmesh_active_color(
 
 
 def get_component_colors(
-        bm: BMesh, layer, layer_type: str, selected_only: bool=False
+        bm: BMesh, layer, layer_type: str
     ) -> dict[BMLoop | BMVert, list]:
     """Get all components (vert/edge/face) based on a given layer type.
 
     Returns a dict of `BMLoop` or `BMVert` and the color."""
     if layer_type == "loop":
-        loops = []
-        for face in bm.faces:
-            for loop in face.loops:
-                if not selected_only or loop.vert.select:
-                    loops.append(loop)
-        sequence = loops
+        sequence = [loop for face in bm.faces for loop in face.loops]
     else: # Verts
-        if selected_only:
-            sequence = [vert for vert in bm.verts if vert.select]
-        else:
-            sequence = bm.verts
+        sequence = bm.verts
 
     components = {}
     for component in sequence:
@@ -115,9 +143,11 @@ def get_component_colors(
     return components
 
 
-def component_select(component, layer_type) -> bool:
-    if layer_type == "loop" and component.vert.select:
-        return True
-    if layer_type == "vert" and component.select:
-        return True
-    return False
+def get_custom_palette(scene) -> PaletteData:
+    """Get the Customizable Palette as palette file data."""
+    swatches = scene.color_plus_swatches
+    return PaletteData(
+        scene.color_plus.custom_palette_name,
+        [iterable_to_list(swatch.color) for swatch in swatches],
+        [swatch.name for swatch in swatches]
+    )
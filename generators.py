@@ -0,0 +1,188 @@
+"""Vectorized vertex color generators.
+
+Generators work on plain NumPy arrays, it is up to
+the operators to read & write the mesh buffers.
+"""
+
+
+import numpy as np
+
+
+def transform_points(points: np.ndarray, matrix) -> np.ndarray:
+    """Apply a 4x4 `Matrix` to `(n, 3)` points."""
+    matrix = np.array(matrix, dtype=np.float32)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def gradient_factors(
+        points: np.ndarray, origin: np.ndarray, axis: np.ndarray,
+        length: float, gradient_type: str='LINEAR'
+    ) -> np.ndarray:
+    """Get the 0-1 gradient position of each point.
+
+    `LINEAR` measures along the axis, `RADIAL` the distance from
+    the axis line & `SPHERICAL` the distance from the origin."""
+    offsets = points - origin
+    projected = offsets @ axis
+    if gradient_type == 'LINEAR':
+        distances = projected
+    elif gradient_type == 'RADIAL':
+        distances = np.linalg.norm(
+            offsets - projected[:, None] * axis, axis=1
+        )
+    else: # Spherical
+        distances = np.linalg.norm(offsets, axis=1)
+    if length <= 0:
+        return np.zeros(len(points), dtype=np.float32)
+    return np.clip(distances / length, 0, 1).astype(np.float32)
+
+
+def gradient_bounds(
+        points: np.ndarray, axis: np.ndarray, gradient_type: str='LINEAR'
+    ) -> tuple[np.ndarray, float]:
+    """Get an origin & length that fit a gradient to the given points."""
+    if not len(points):
+        return np.zeros(3, dtype=np.float32), 0.0
+    if gradient_type == 'LINEAR':
+        projected = points @ axis
+        origin = axis * projected.min()
+        return origin, float(projected.max() - projected.min())
+
+    origin = (points.min(axis=0) + points.max(axis=0)) / 2
+    offsets = points - origin
+    if gradient_type == 'RADIAL':
+        offsets = offsets - (offsets @ axis)[:, None] * axis
+    return origin, float(np.linalg.norm(offsets, axis=1).max())
+
+
+def interpolate_colors(
+        factors: np.ndarray, start_color, end_color
+    ) -> np.ndarray:
+    """Linearly interpolate between two colors."""
+    start_color = np.asarray(start_color, dtype=np.float32)
+    end_color = np.asarray(end_color, dtype=np.float32)
+    return start_color + (end_color - start_color) * factors[:, None]
+
+
+def ramp_colors(factors: np.ndarray, ramp_table: np.ndarray) -> np.ndarray:
+    """Look colors up in a pre-sampled `(n, 4)` color ramp table."""
+    idx = np.rint(factors * (len(ramp_table) - 1)).astype(np.int32)
+    return ramp_table[idx]
+
+
+def dirt_tones(
+        points: np.ndarray, normals: np.ndarray, adjacency,
+        blur_strength: float=1.0, blur_iterations: int=1,
+        clean_angle: float=np.pi, dirt_angle: float=0.0,
+        dirt_only: bool=False, normalize: bool=True
+    ) -> np.ndarray:
+    """Get a per-vertex dirt tone (0 dirty, 1 clean) from mesh concavity.
+
+    Matches Blender's own Dirty Vertex Colors: the angle between each
+    vertex normal & the average direction to its connected vertices
+    is < 90 degrees in creases & > 90 degrees on protruding surfaces."""
+    if not len(points):
+        return np.zeros(0, dtype=np.float32)
+
+    rows, indices = adjacency.rows, adjacency.indices
+    degree = adjacency.degree
+
+    directions = points[indices] - points[rows]
+    lengths = np.linalg.norm(directions, axis=1)
+    directions /= np.maximum(lengths, 1e-12)[:, None]
+
+    connected = degree > 0
+    average_directions = adjacency.neighbor_sum(directions)
+    average_directions[connected] /= degree[connected, None]
+
+    # NOTE: Loose vertices are assumed to be flat (90 degrees)
+    tones = np.full(len(points), np.pi / 2)
+    dots = np.einsum('ij,ij->i', normals, average_directions)
+    tones[connected] = np.arccos(np.clip(dots[connected], -1, 1))
+
+    tones = np.maximum(tones, dirt_angle)
+    if not dirt_only:
+        tones = np.minimum(tones, clean_angle)
+
+    for _ in range(blur_iterations):
+        tones = (tones + blur_strength * adjacency.neighbor_sum(tones)) \
+              / (degree * blur_strength + 1)
+
+    if normalize:
+        min_tone, max_tone = tones.min(), tones.max()
+    else:
+        min_tone, max_tone = dirt_angle, clean_angle
+    tone_range = max_tone - min_tone
+    tone_range = 0.0 if tone_range < .0001 else 1 / tone_range
+
+    tones = (tones - min_tone) * tone_range
+    if dirt_only:
+        tones = np.minimum(tones, .5) * 2
+    return tones.astype(np.float32)
+
+
+def random_colors(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Get `count` random opaque colors."""
+    colors = rng.random((count, 4), dtype=np.float32)
+    colors[:, 3] = 1
+    return colors
+
+
+def face_island_indices(uv_islands: list, face_count: int) -> np.ndarray:
+    """Get the UV island index of every face from lists of face indices."""
+    face_islands = np.zeros(face_count, dtype=np.int64)
+    for idx, island in enumerate(uv_islands):
+        face_islands[island] = idx
+    return face_islands
+
+
+def uv_border_corners(topology, face_islands: np.ndarray) -> np.ndarray:
+    """Get a mask of the face corners touching their UV island border.
+
+    An edge is a border of an island if it is a mesh boundary or
+    also belongs to a face of another island."""
+    loop_edge_indices = topology.loop_edge_indices
+    loop_islands = face_islands[topology.loop_face_indices]
+    edge_count = len(topology.edge_vertices)
+    if not len(loop_islands):
+        return np.zeros(0, dtype=bool)
+
+    edge_min_island = np.full(edge_count, loop_islands.max() + 1)
+    np.minimum.at(edge_min_island, loop_edge_indices, loop_islands)
+    edge_max_island = np.full(edge_count, -1)
+    np.maximum.at(edge_max_island, loop_edge_indices, loop_islands)
+    border_edges = (topology.edge_face_counts == 1) \
+                 | (edge_min_island != edge_max_island)
+
+    # Pair both vertices of every border edge with the island
+    # it borders, then match the corners against those pairs
+    island_count = int(loop_islands.max()) + 1
+    border_loops = border_edges[loop_edge_indices]
+    border_verts = topology.edge_vertices[loop_edge_indices[border_loops]]
+    border_islands = loop_islands[border_loops]
+    border_keys = np.concatenate((
+        border_verts[:, 0] * island_count + border_islands,
+        border_verts[:, 1] * island_count + border_islands
+    ))
+    corner_keys = topology.loop_vertex_indices.astype(np.int64) \
+                * island_count + loop_islands
+    return np.isin(corner_keys, border_keys)
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -0,0 +1,164 @@
+"""Bulk (NumPy) access to image pixels.
+
+Pixels are read with a single `foreach_get` into a float32 buffer,
+that buffer is the only full size copy made. Everything else works
+on views or on (small) samples of it, including sampling the image
+through the UVs of every face corner.
+"""
+
+
+import math
+
+import numpy as np
+
+from bpy.types import Image
+
+from .colorspace import linear_to_srgb
+from .topology import MeshTopology
+
+
+# Pixels sampled from an image when building a palette
+IMAGE_SAMPLE_COUNT = 1 << 20
+
+
+def read_pixels(image: Image) -> np.ndarray:
+    """Read the pixels of an image as a `(height, width, channels)` array.
+
+    Rows start at the bottom of the image, like Blender stores them."""
+    width, height = image.size
+    if not width or not height:
+        raise ValueError(f"Image \"{image.name}\" has no pixel data")
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)
+
+
+def is_linear(image: Image) -> bool:
+    """Float images store scene linear pixels, byte images
+    store them in their (usually sRGB) color space."""
+    return image.is_float and not image.colorspace_settings.is_data
+
+
+def to_rgba(pixels: np.ndarray) -> np.ndarray:
+    """Expand `(..., channels)` pixels to `(..., 4)`."""
+    channels = pixels.shape[-1]
+    if channels == 4:
+        return pixels
+    rgba = np.ones(pixels.shape[:-1] + (4,), dtype=np.float32)
+    if channels >= 3:
+        rgba[..., :3] = pixels[..., :3]
+    else: # Grayscale (& alpha)
+        rgba[..., :3] = pixels[..., :1]
+        if channels == 2:
+            rgba[..., 3] = pixels[..., 1]
+    return rgba
+
+
+def downsample(pixels: np.ndarray, sample_count: int) -> np.ndarray:
+    """Get an evenly strided view of at most ~`sample_count` pixels."""
+    height, width = pixels.shape[:2]
+    step = max(1, math.ceil(math.sqrt(height * width / sample_count)))
+    return pixels[::step, ::step]
+
+
+def sample_image_colors(
+        image: Image, sample_count: int=IMAGE_SAMPLE_COUNT
+    ) -> np.ndarray:
+    """Get up to ~`sample_count` evenly spread `(n, 4)` sRGB
+    colors of an image."""
+    samples = downsample(read_pixels(image), sample_count)
+    colors = to_rgba(samples).reshape(-1, 4)
+    if is_linear(image):
+        return linear_to_srgb(colors)
+    return colors
+
+
+def sample_bilinear(pixels: np.ndarray, uvs: np.ndarray) -> np.ndarray:
+    """Bilinearly sample `(height, width, channels)` pixels at `(n, 2)`
+    UVs. The image repeats outside of the 0-1 UV range."""
+    height, width = pixels.shape[:2]
+    # NOTE: Pixel centers sit at half pixel offsets
+    x = uvs[:, 0].astype(np.float64) * width - .5
+    y = uvs[:, 1].astype(np.float64) * height - .5
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = (x - x0).astype(np.float32)[:, None]
+    fy = (y - y0).astype(np.float32)[:, None]
+
+    x0 = x0.astype(np.int64) % width
+    y0 = y0.astype(np.int64) % height
+    x1 = (x0 + 1) % width
+    y1 = (y0 + 1) % height
+
+    bottom = pixels[y0, x0] * (1 - fx) + pixels[y0, x1] * fx
+    top = pixels[y1, x0] * (1 - fx) + pixels[y1, x1] * fx
+    return bottom * (1 - fy) + top * fy
+
+
+def corner_footprints(
+        uvs: np.ndarray, topology: MeshTopology, grid: int
+    ):
+    """Yield `grid * grid` sets of `(n, 2)` UVs spread over the share
+    of its face each corner covers.
+
+    A corner's share is the quad between the corner, the midpoints
+    of its two edges & the face center, so the corners of a face
+    tile its whole UV footprint."""
+    face_indices = topology.loop_face_indices
+    starts = topology.face_loop_starts[face_indices]
+    totals = topology.face_loop_totals[face_indices]
+    local = np.arange(len(uvs)) - starts
+    next_uvs = uvs[starts + (local + 1) % totals]
+    prev_uvs = uvs[starts + (local - 1) % totals]
+
+    face_totals = np.maximum(topology.face_loop_totals, 1)
+    centers = np.empty_like(uvs)
+    for channel in range(2):
+        centers[:, channel] = (np.bincount(
+            face_indices, weights=uvs[:, channel],
+            minlength=len(face_totals)
+        ) / face_totals)[face_indices]
+
+    mid_next = (uvs + next_uvs) / 2
+    mid_prev = (uvs + prev_uvs) / 2
+    for row in range(grid):
+        b = (row + .5) / grid
+        for column in range(grid):
+            a = (column + .5) / grid
+            yield (1 - a) * (1 - b) * uvs + a * (1 - b) * mid_next \
+                + a * b * centers + (1 - a) * b * mid_prev
+
+
+def sample_corner_colors(
+        pixels: np.ndarray, uvs: np.ndarray,
+        topology: MeshTopology, supersampling: int=1
+    ) -> np.ndarray:
+    """Sample pixels for every face corner, returns `(n, channels)`.
+
+    Without supersampling each corner samples its own UV, otherwise
+    it averages a `supersampling ** 2` grid over its footprint."""
+    if supersampling <= 1:
+        return sample_bilinear(pixels, uvs)
+    colors = np.zeros((len(uvs), pixels.shape[-1]), dtype=np.float32)
+    for footprint in corner_footprints(uvs, topology, supersampling):
+        colors += sample_bilinear(pixels, footprint)
+    return colors / supersampling ** 2
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -1,30 +1,21 @@
-import colorsys
-from random import random
-
 import bpy
 import bpy_extras
 import bmesh
 from bpy.types import Operator, Object, Context
 from bpy.props import FloatVectorProperty
+from bpy_extras.io_utils import ExportHelper
 
 from .functions import (
     iterable_to_list,
     create_color,
     get_active_color,
     get_bmesh_active_color,
-    get_component_colors
+    get_component_colors,
+    get_selected_meshes,
+    create_colors,
+    get_custom_palette
 )
-from .constants import BLANK_ARRAY
-
-
-# TODO:
-# - Basic blend modes (Replace, multiply, subtract)
-#   - https://stackoverflow.com/questions/726549/algorithm-for-additive-color-mixing-for-rgb-valuess
-# - Vertex color set syncing
-#   - This would be useful for forcing use of the active color set
-#     when working with multiple objects, objects without a matching
-#     color set should have a new set made with identical rendering
-#     and stack priority (if possible)
+from .constants import BLANK_ARRAY, DEFAULT_CUSTOM_PALETTE
 
 
 #########################################
@@ -81,55 +72,77 @@ class COLORPLUS_OT_edit_color(DefaultsOperator):
     )
 
     variation_value: bpy.props.StringProperty(options={'HIDDEN'})
-    custom_color_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    custom_color_index: bpy.props.IntProperty(default=-1, options={'HIDDEN'})
 
-    def change_color(self, component, layer, rgba_value) -> None:
-        """Change a vert/loop components color attribute."""
-        if self.edit_type in ('clear', 'clear_all'):
-            component[layer] = BLANK_ARRAY
-            return
+    def get_target_mask(self, selection, domain: str):
+        """Get a mask of the vert/corner components to edit."""
+        import numpy as np
 
-        for idx, value in enumerate(rgba_value):
-            if value is None:
-                rgba_value[idx] = component[layer][idx]
+        color_plus = bpy.context.scene.color_plus
+        use_selected = not "_all" in self.edit_type
+
+        # Hard, every corner of the selected faces
+        if domain == 'CORNER' and color_plus.interp_type == "hard":
+            mask = selection.face_corners
+        # Smooth
+        else:
+            mask = selection.domain_mask(domain)
+        if not use_selected:
+            mask = np.ones_like(mask)
+        return mask
 
+    def get_blend_args(self, rgba_value) -> tuple:
+        """Get the color, blend mode, opacity & channels to apply."""
+        color_plus = bpy.context.scene.color_plus
+
+        if self.variation_value == 'visibility':
+            visibility_color = float(color_plus.material_visibility)
+            return (visibility_color, 0, 0, 1), 'REPLACE', 1.0, (True,) * 4
+
+        channels = [value is not None for value in rgba_value]
+        color = [0 if value is None else value for value in rgba_value]
         if self.variation_value == 'alpha_only':
-            component[layer] = (
-                component[layer][0], component[layer][1],
-                component[layer][2], rgba_value[3]
-            )
+            channels = [False, False, False, True]
         elif self.variation_value == 'color_only':
-            component[layer] = (
-                rgba_value[0], rgba_value[1],
-                rgba_value[2], component[layer][3]
-            )
-        elif self.variation_value == 'visibility':
-            color_plus = bpy.context.scene.color_plus
-            visibility_color = color_plus.material_visibility
-            component[layer] = (float(visibility_color), 0, 0, 1)
-        else:
-            component[layer] = rgba_value
+            channels = [True, True, True, False]
+        return (
+            color, color_plus.blend_mode,
+            color_plus.blend_opacity, channels
+        )
 
     def execute(self, context: Context):
-        color_plus = context.scene.color_plus
+        from .attributes import read_colors, write_colors
+        from .blending import blend_colors
+        from .colorspace import quantize_byte
+        from .selection import get_selection
 
-        saved_mode=context.object.mode
-        bpy.ops.object.mode_set(mode='OBJECT')
-        context.object.select_set(True)
+        color_plus = context.scene.color_plus
 
         # Get the RGB value based on the property given
         rgba_value = BLANK_ARRAY
-        if self.custom_color_name:
-            rgba_value = getattr(color_plus, self.custom_color_name)
+        if self.custom_color_index >= 0:
+            swatches = context.scene.color_plus_swatches
+            if self.custom_color_index >= len(swatches):
+                self.report({'ERROR'}, "Swatch does not exist")
+                return {'CANCELLED'}
+            rgba_value = swatches[self.custom_color_index].color
         else:
             rgba_value = getattr(color_plus, 'color_wheel')
 
+        saved_mode=context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+        context.object.select_set(True)
+
         if self.variation_value == 'value_var':
             rgba_value = [rgba_value[0], rgba_value[1], rgba_value[2], None]
         elif self.variation_value == 'alpha_var':
             rgba_value = [None, None, None, rgba_value[3]]
+        else:
+            rgba_value = iterable_to_list(rgba_value)
 
-        use_selected = not "_all" in self.edit_type
+        clear = self.edit_type in ('clear', 'clear_all')
+        color, blend_mode, opacity, channels = \
+            self.get_blend_args(rgba_value)
 
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
@@ -138,32 +151,29 @@ class COLORPLUS_OT_edit_color(DefaultsOperator):
             if active_color is None:
                 active_color = create_color(ob.data)
 
-            bm = bmesh.new()
-            bm.from_mesh(ob.data)
-            layer, layer_type = get_bmesh_active_color(bm, ob.data)
-            components = \
-                get_component_colors(bm, layer, layer_type, use_selected)
-            for component, _color in components.items():
-                # Smooth
-                if color_plus.interp_type == "smooth" \
-                or active_color.domain != 'CORNER':
-                    if layer_type == "loop":
-                        for loop in component.vert.link_loops:
-                            self.change_color(loop, layer, rgba_value)
-                    else: # Vert
-                        self.change_color(component, layer, rgba_value)
-                # Hard
-                elif color_plus.interp_type == "hard":
-                    if use_selected and component.face.select:
-                        for loop in component.face.loops:
-                            self.change_color(component, layer, rgba_value)
-            bm.to_mesh(ob.data)
+            mask = self.get_target_mask(
+                get_selection(ob.data), active_color.domain
+            )
+            if not mask.any():
+                continue
+
+            # Blend the whole selection at once
+            colors = read_colors(active_color)
+            if clear:
+                colors[mask] = BLANK_ARRAY
+            else:
+                blended = blend_colors(
+                    colors[mask], color, blend_mode, opacity, channels,
+                    blend_alpha=self.variation_value in (
+                        'alpha_only', 'alpha_var'
+                    )
+                )
+                if active_color.data_type == 'BYTE_COLOR':
+                    blended = quantize_byte(blended)
+                colors[mask] = blended
+            write_colors(active_color, colors)
 
         bpy.ops.object.mode_set(mode=saved_mode)
-        preferences = \
-            context.preferences.addons[__package__].preferences
-        if preferences.auto_palette_refresh:
-            bpy.ops.color_plus.refresh_palette_outliner(color=rgba_value)
         return {'FINISHED'}
 
 
@@ -212,10 +222,31 @@ class COLORPLUS_OT_set_color_from_active(DefaultsOperator):
     bl_idname = "color_plus.set_color_from_active"
     bl_label = "Color from Active Vertex"
 
+    sample_mode: bpy.props.EnumProperty(
+        name="Sampling",
+        items=(
+            ('FIRST', "First Corner", "Use the color of the first face corner of the vertex"),
+            ('AVERAGE', "Average", "Average the colors of all face corners of the vertex"),
+            ('MOST_COMMON', "Most Common", "Use the most common face corner color of the vertex")
+        )
+    )
+
     @classmethod
     def poll(cls, context: Context):
         return context.mode == 'EDIT_MESH'
 
+    def sample_corners(self, colors: list) -> list:
+        """Get a single color from the face corner colors of a vertex."""
+        if self.sample_mode == 'AVERAGE':
+            return [sum(channel) / len(colors) for channel in zip(*colors)]
+        if self.sample_mode == 'MOST_COMMON':
+            # NOTE: Compare at 8-bit precision, like the palette
+            keys = [tuple(round(channel * 255) for channel in color)
+                    for color in colors]
+            most_common = max(keys, key=keys.count)
+            return colors[keys.index(most_common)]
+        return colors[0]
+
     def execute(self, context: Context):
         ob = context.object
         saved_mode = ob.mode
@@ -236,26 +267,100 @@ class COLORPLUS_OT_set_color_from_active(DefaultsOperator):
             self.report({'ERROR'}, "Please select a vertex to get color from")
             return {'CANCELLED'}
 
-        # Get active vertex color
-        # TODO: Clean up all _layer_type variables
-        # for full vertex & face corner domain support
+        # Only read the active vertex, never the whole mesh
         layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
-        for component, _color in components.items():
-            if layer_type == "loop" \
-            and component.vert.select \
-            and component.vert == active_selection:
-                if component.vert.select and component.vert == active_selection:
-                    context.scene.color_plus.color_wheel = component[layer]
-                    break
-            # Vert
-            if layer_type != "loop" \
-            and component.select \
-            and component == active_selection:
-                context.scene.color_plus.color_wheel = component[layer]
-                break
+        if layer is None:
+            self.report({'ERROR'}, "Could not find color data on active object")
+            return {'CANCELLED'}
+        if layer_type == "loop":
+            colors = [iterable_to_list(loop[layer])
+                      for loop in active_selection.link_loops]
+        else: # Vert
+            colors = [iterable_to_list(active_selection[layer])]
+        if not colors:
+            self.report({'ERROR'}, "The Active Vertex has no face corners")
+            return {'CANCELLED'}
+        context.scene.color_plus.color_wheel = self.sample_corners(colors)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_color_statistics(DefaultsOperator):
+    """Get the average, median & most common color of the selection across all selected objects"""
+    bl_idname = "color_plus.color_statistics"
+    bl_label = "Selection Statistics"
+
+    def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors
+        from .palette import area_weights, color_stats
+        from .selection import get_selection
+        from .topology import get_topology
+
+        color_plus = context.scene.color_plus
+        use_selected = context.mode == 'EDIT_MESH'
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Concatenate every mesh's buffer, stats are global
+        buffers = []
+        weights = []
+        for data in get_selected_meshes(context):
+            active_color = get_active_color(data)
+            if active_color is None:
+                continue
+            colors = read_colors(active_color)
+            mask = np.ones(len(colors), dtype=bool)
+            topology = get_topology(data)
+            if use_selected:
+                mask = get_selection(data, topology) \
+                    .domain_mask(active_color.domain)
+            buffers.append(colors[mask])
+            if color_plus.stats_area_weighted:
+                weights.append(
+                    area_weights(data, topology, active_color.domain)[mask]
+                )
 
         bpy.ops.object.mode_set(mode=saved_mode)
+
+        stats = None
+        if buffers:
+            stats = color_stats(
+                np.concatenate(buffers),
+                np.concatenate(weights) if weights else None
+            )
+        if stats is None:
+            color_plus.stats_count = 0
+            self.report({'WARNING'}, "No colors found in the selection")
+            return {'CANCELLED'}
+
+        color_plus.stats_mean = stats.mean
+        color_plus.stats_median = stats.median
+        color_plus.stats_mode = stats.mode
+        color_plus.stats_count = stats.count
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_use_color_statistic(DefaultsOperator):
+    """Set the Active Color from a selection statistic"""
+    bl_idname = "color_plus.use_color_statistic"
+    bl_label = "Set as Active Color"
+    bl_options = {'INTERNAL', 'REGISTER', 'UNDO'}
+
+    statistic: bpy.props.EnumProperty(
+        items=(
+            ('stats_mean', "Average", ""),
+            ('stats_median', "Median", ""),
+            ('stats_mode', "Most Common", "")
+        ),
+        options={'HIDDEN'}
+    )
+
+    def execute(self, context: Context):
+        color_plus = context.scene.color_plus
+        color_plus.color_wheel = getattr(color_plus, self.statistic)
         return {'FINISHED'}
 
 
@@ -294,6 +399,151 @@ class COLORPLUS_OT_remove_all_vertex_color(DefaultsOperator):
         return {'FINISHED'}
 
 
+class COLORPLUS_OT_convert_color_attribute(DefaultsOperator):
+    """Convert the active color attribute of all selected objects to another domain and/or data type"""
+    bl_idname = "color_plus.convert_color_attribute"
+    bl_label = "Convert Color Attribute"
+
+    domain: bpy.props.EnumProperty(
+        items=(
+            ('POINT', "Vertex", ""),
+            ('CORNER', "Face Corner", "")
+        ),
+        name="Domain"
+    )
+    data_type: bpy.props.EnumProperty(
+        items=(
+            ('FLOAT_COLOR', "Color", "32-bit floating point values"),
+            ('BYTE_COLOR', "Byte Color", "8-bit integer values")
+        ),
+        name="Data Type"
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None and context.object.type == 'MESH'
+
+    def invoke(self, context: Context, _event):
+        active_color = get_active_color(context.object.data)
+        if active_color is not None:
+            self.domain = active_color.domain
+            self.data_type = active_color.data_type
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context: Context):
+        from .attributes import convert_color_attribute
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        converted = 0
+        for data in get_selected_meshes(context):
+            active_color = get_active_color(data)
+            if active_color is None \
+            or (active_color.domain == self.domain \
+            and active_color.data_type == self.data_type):
+                continue
+            convert_color_attribute(
+                data, active_color, self.domain, self.data_type
+            )
+            converted += 1
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        self.report({'INFO'}, f"Converted {converted} color attribute(s)")
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_sync_color_attributes(DefaultsOperator):
+    """Give all selected objects the Active Object's active color attribute, with the same name, type, domain & render status"""
+    bl_idname = "color_plus.sync_color_attributes"
+    bl_label = "Sync Color Attributes"
+
+    fill_color: FloatVectorProperty(
+        name="Fill Color",
+        description="Color used to fill newly created color attributes",
+        subtype='COLOR_GAMMA',
+        default=BLANK_ARRAY, size=4,
+        min=0, max=1
+    )
+    convert_mismatched: bpy.props.BoolProperty(
+        name="Convert Mismatched",
+        description="Convert same-named color attributes of another domain or type. Lossy: corners are averaged into points & floats are quantized to bytes",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None \
+        and context.object.type == 'MESH' \
+        and get_active_color(context.object.data) is not None
+
+    def execute(self, context: Context):
+        from .attributes import (
+            get_color_index,
+            get_sync_signature,
+            convert_color_attribute
+        )
+
+        source_data = context.object.data
+        signature = get_sync_signature(source_data)
+        name, domain, data_type, use_render = signature
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Plan which meshes need a new attribute and
+        # which only need a (lossy, opt-in) conversion and/or re-ordering
+        missing = []
+        mismatched = []
+        synced = []
+        for data in get_selected_meshes(context):
+            if data == source_data \
+            or get_sync_signature(data) == signature:
+                continue
+            attribute = data.color_attributes.get(name)
+            if attribute is None:
+                missing.append(data)
+                continue
+            if (attribute.domain, attribute.data_type) != (domain, data_type) \
+            and not self.convert_mismatched:
+                mismatched.append(data)
+                continue
+            synced.append((
+                data,
+                convert_color_attribute(data, attribute, domain, data_type)
+            ))
+
+        synced += zip(missing, create_colors(
+            missing, name, self.fill_color,
+            domain, data_type, set_active=False
+        ))
+
+        for data, attribute in synced:
+            # NOTE: Use the attribute itself, Blender may have renamed it
+            idx = get_color_index(data, attribute.name)
+            if idx < 0:
+                continue
+            color_attributes = data.color_attributes
+            color_attributes.active_color_index = idx
+            if use_render:
+                color_attributes.render_color_index = idx
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        self.report(
+            {'INFO'},
+            f"Synced {len(synced)} mesh(es), "
+            f"{len(missing)} new color attribute(s)"
+        )
+        if mismatched:
+            self.report(
+                {'WARNING'},
+                f"Skipped {len(mismatched)} mesh(es) with a \"{name}\" "
+                "attribute of another domain or type, enable "
+                "Convert Mismatched to convert them"
+            )
+        return {'FINISHED'}
+
+
 class COLORPLUS_OT_refresh_palette_outliner(DefaultsOperator):
     """Manual refresh for the palette outliner of the Active Object as sometimes it doesn't update correctly on its own"""
     bl_idname = "color_plus.refresh_palette_outliner"
@@ -306,76 +556,6 @@ class COLORPLUS_OT_refresh_palette_outliner(DefaultsOperator):
         options={'HIDDEN'}
     )
 
-    # TODO Unused sorting method, currently breaks the
-    # outliner in ways I haven't been able to solve
-    #def sort_colors(self, colors: list) -> tuple[list, list]:
-    #    # Convert to HSV, sort list by value
-    #    colors_hsv = []
-    #    for color in colors:
-    #        colors_hsv.append([*colorsys.rgb_to_hsv(*color[:3]), color[3]])
-    #
-    #    # Separate and sort
-    #    hsv_sep = [color for color in colors_hsv if color[0] == 0]
-    #    hsv_values_sorted = sorted(hsv_sep, key=itemgetter(2))
-    #    hsv_hues = [color for color in colors_hsv if color not in hsv_sep]
-    #    hsv_hues_sorted = sorted(hsv_hues, key=itemgetter(0))
-    #    colors_hsv = hsv_values_sorted + hsv_hues_sorted
-    #
-    #    # Convert back to RGB
-    #    colors_rgb = []
-    #    for color in colors_hsv:
-    #        colors_rgb.append(
-    #            [*colorsys.hsv_to_rgb(*color[:3]), color[3]]
-    #        )
-    #    return colors_hsv, colors_rgb
-
-    def get_unique_colors(self, components: dict) -> list:
-        preferences = \
-            bpy.context.preferences.addons[__package__].preferences
-        colors = []
-        for color in components.values():
-            if color in colors or color == list(BLANK_ARRAY):
-                continue
-            colors.append(color)
-            if len(colors) > preferences.max_outliner_items:
-                break
-        return colors
-
-    def format_palette_color_name(self, color) -> list:
-        item_color = []
-        if bpy.context.scene.color_plus.rgb_hsv_convert_options == 'rgb':
-            for channel in color[:-1]:
-                item_color.append(round(channel * 255))
-        else: # HSV
-            color_hsv = \
-                colorsys.rgb_to_hsv(color[0], color[1], color[2])
-            for channel in color_hsv:
-                if channel.is_integer():
-                    channel = round(channel)
-                item_color.append(round(channel, 2))
-        if color[3].is_integer():
-            alpha_channel = round(color[3])
-        else:
-            alpha_channel = round(color[3], 3)
-        item_color.append(alpha_channel)
-        return item_color
-
-    def generate_palette(self, ob: Object, colors: list) -> None:
-        for idx, color in enumerate(colors):
-            item = ob.color_palette.add()
-            item.saved_color = color
-            item.color = color
-            #item.id = len(ob.color_palette) - 1
-            if idx == self.saved_active_idx:
-                item.id = self.saved_active_idx
-            else:
-                item.id = len(ob.color_palette) - 1
-            item_color = self.format_palette_color_name(color)
-            item.name = "({}, {}, {}, {})".format(
-                item_color[0], item_color[1],
-                item_color[2], item_color[3]
-            )
-
     def check_existing_color(self, ob: Object) -> bool:
         """Check if the sent color already exists in the palette outliner.
 
@@ -400,8 +580,7 @@ class COLORPLUS_OT_refresh_palette_outliner(DefaultsOperator):
         return False
 
     def execute(self, context: Context):
-        saved_mode=context.object.mode
-        bpy.ops.object.mode_set(mode='EDIT')
+        from .outliner import rebuild_palette
 
         duplicate_check = False
         if [*self.color] != list(BLANK_ARRAY):
@@ -414,35 +593,47 @@ class COLORPLUS_OT_refresh_palette_outliner(DefaultsOperator):
             # already exists in the palette outliner
             if duplicate_check and self.check_existing_color(ob):
                 continue
-            ob.color_palette.clear()
+            rebuild_palette(ob, self.saved_active_idx)
 
-            # Preserve the original index color value
-            if len(ob.color_palette):
-                palette = ob.color_palette[ob.color_palette_active]
-                saved_color = iterable_to_list(palette.color)
+        self.color = list(BLANK_ARRAY)
+        return {'FINISHED'}
 
-            bm = bmesh.from_edit_mesh(ob.data)
-            layer, layer_type = get_bmesh_active_color(bm, ob.data)
-            components = get_component_colors(bm, layer, layer_type)
-            colors = self.get_unique_colors(components)
-            # TODO Unused sorting method, currently breaks the
-            # outliner in ways I haven't been able to solve
-            #colors = self.sort_colors(colors)
 
-            self.generate_palette(ob, colors)
+class COLORPLUS_OT_refresh_scene_palette(DefaultsOperator):
+    """Gather the colors of every mesh object in the scene or collection, only re-reading meshes that changed"""
+    bl_idname = "color_plus.refresh_scene_palette"
+    bl_label = "Refresh Scene Palette"
+    bl_options = {'REGISTER'}
 
-            if not 'saved_color' in locals():
-                continue
-            for color in ob.color_palette:
-                converted_color = iterable_to_list(color.color)
-                if converted_color == saved_color:
-                    ob.color_palette_active = color.id
-                    del saved_color
-                    break
-                del saved_color
+    def execute(self, context: Context):
+        from .outliner import rebuild_scene_palette
 
-        bpy.ops.object.mode_set(mode=saved_mode)
-        self.color = list(BLANK_ARRAY)
+        rebuild_scene_palette(context)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_select_scene_palette_objects(DefaultsOperator):
+    """Select every object using the active Scene Palette color"""
+    bl_idname = "color_plus.select_scene_palette_objects"
+    bl_label = "Select Objects with Color"
+
+    @classmethod
+    def poll(cls, context: Context):
+        scene = context.scene
+        return context.mode == 'OBJECT' \
+        and 0 <= scene.color_plus_palette_active < len(scene.color_plus_palette)
+
+    def execute(self, context: Context):
+        from .outliner import get_objects_using_color
+
+        scene = context.scene
+        item = scene.color_plus_palette[scene.color_plus_palette_active]
+        objects = get_objects_using_color(context, item.color)
+        for ob in objects:
+            ob.select_set(True)
+        if objects:
+            context.view_layer.objects.active = objects[0]
+        self.report({'INFO'}, f"Selected {len(objects)} object(s)")
         return {'FINISHED'}
 
 
@@ -453,21 +644,24 @@ class COLORPLUS_OT_change_outliner_color(DefaultsOperator):
     saved_active_idx: bpy.props.IntProperty()
 
     def execute(self, context: Context):
+        from .attributes import read_colors, write_colors
+        from .colorspace import quantize_byte
+        from .palette import remap_colors
+
         ob = context.object
         saved_mode = ob.mode
-        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.object.mode_set(mode='OBJECT')
 
         palette = ob.color_palette[self.saved_active_idx]
-        palette_saved_color = iterable_to_list(palette.saved_color)
-
-        bm = bmesh.from_edit_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
-        for component, color in components.items():
-            if color != palette_saved_color:
-                continue
-            component[layer] = palette.color
-        bmesh.update_edit_mesh(ob.data)
+        active_color = get_active_color(ob.data)
+        if active_color is not None:
+            colors, _count = remap_colors(
+                read_colors(active_color),
+                palette.saved_color, palette.color
+            )
+            if active_color.data_type == 'BYTE_COLOR':
+                colors = quantize_byte(colors)
+            write_colors(active_color, colors)
 
         palette.name = \
             f'({round(palette.color[0] * 255)}, ' \
@@ -479,6 +673,98 @@ class COLORPLUS_OT_change_outliner_color(DefaultsOperator):
         return {'FINISHED'}
 
 
+class COLORPLUS_OT_remap_colors(DefaultsOperator):
+    """Replace colors on all selected objects from an old -> new color table in a single pass"""
+    bl_idname = "color_plus.remap_colors"
+    bl_label = "Remap Colors"
+
+    source: bpy.props.EnumProperty(
+        name="Source",
+        items=(
+            ('CUSTOM_PALETTE', "Custom Palette", "Map the Palette Outliner colors, in order, to the Customizable Palette colors"),
+            ('FILE', "File", "Load the table from a JSON file of [old, new] color pairs")
+        )
+    )
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None and context.object.type == 'MESH'
+
+    def invoke(self, context: Context, event):
+        if self.source == 'FILE':
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
+
+    def read_table_file(self) -> tuple[list, list]:
+        import json
+
+        with open(bpy.path.abspath(self.filepath), encoding="utf-8") as file:
+            pairs = json.load(file)
+        old_colors = []
+        new_colors = []
+        for old_color, new_color in pairs:
+            # NOTE: Alpha is optional
+            old_colors.append([*old_color, 1][:4])
+            new_colors.append([*new_color, 1][:4])
+        return old_colors, new_colors
+
+    def get_table(self, context: Context) -> tuple[list, list]:
+        ob = context.object
+        if self.source == 'FILE':
+            return self.read_table_file()
+        # Custom palette
+        pairs = list(zip(
+            [palette.color for palette in ob.color_palette],
+            [swatch.color for swatch in context.scene.color_plus_swatches]
+        ))
+        return [old for old, _new in pairs], [new for _old, new in pairs]
+
+    def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors
+        from .colorspace import quantize_byte
+        from .palette import remap_colors
+
+        try:
+            old_colors, new_colors = self.get_table(context)
+            old_colors = np.asarray(old_colors, dtype=np.float32)
+            new_colors = np.asarray(new_colors, dtype=np.float32)
+            if old_colors.size and (old_colors.shape[-1] != 4
+                                    or new_colors.shape != old_colors.shape):
+                raise ValueError("Colors must be lists of 3 or 4 numbers")
+        except (OSError, ValueError, TypeError) as error:
+            self.report({'ERROR'}, f"Could not read the remap table: {error}")
+            return {'CANCELLED'}
+        if not len(old_colors):
+            self.report({'INFO'}, "Nothing to remap")
+            return {'CANCELLED'}
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        remapped = 0
+        for data in get_selected_meshes(context):
+            active_color = get_active_color(data)
+            if active_color is None:
+                continue
+            colors, count = remap_colors(
+                read_colors(active_color), old_colors, new_colors
+            )
+            if not count:
+                continue
+            if active_color.data_type == 'BYTE_COLOR':
+                colors = quantize_byte(colors)
+            write_colors(active_color, colors)
+            remapped += count
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        self.report({'INFO'}, f"Remapped {remapped} color(s)")
+        return {'FINISHED'}
+
+
 class COLORPLUS_OT_get_active_outliner_color(DefaultsOperator):
     """Apply the Outliner Color to the Active Color"""
     bl_idname = "color_plus.get_active_outliner_color"
@@ -517,6 +803,12 @@ class COLORPLUS_OT_select_outliner_color(DefaultsOperator):
     bl_label = "Select Geometry from Outliner Color"
 
     def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors
+        from .colorspace import color_keys
+        from .selection import get_selection, select_vertices
+        from .topology import get_topology
+
         ob = context.object
         saved_mode = ob.mode
         bpy.ops.object.mode_set(mode='OBJECT')
@@ -524,21 +816,19 @@ class COLORPLUS_OT_select_outliner_color(DefaultsOperator):
         context.tool_settings.mesh_select_mode = (True, False, False)
 
         palette = ob.color_palette[ob.color_palette_active]
-        active_color = iterable_to_list(palette.color)
-
-        # Object mode BMesh correct mesh update
-        bm = bmesh.new()
-        bm.from_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
-        for component, color in components.items():
-            if color != active_color:
-                continue
-            if layer_type == 'loop':
-                component.vert.select_set(True)
-            else: # Vert
-                component.select_set(True)
-        bm.to_mesh(ob.data)
+        active_color = get_active_color(ob.data)
+        if active_color is not None:
+            topology = get_topology(ob.data)
+            colors = read_colors(active_color)
+            matched = \
+                color_keys(colors) == color_keys(np.array(palette.color))
+            if active_color.domain == 'CORNER':
+                matched = np.bincount(
+                    topology.loop_vertex_indices[matched],
+                    minlength=topology.vert_count
+                ) > 0
+            selection = get_selection(ob.data, topology)
+            select_vertices(ob.data, selection.verts | matched, topology)
 
         bpy.ops.object.mode_set(mode=saved_mode)
         return {'FINISHED'}
@@ -566,11 +856,6 @@ class COLORPLUS_OT_delete_outliner_color(DefaultsOperator):
         bmesh.update_edit_mesh(ob.data)
 
         bpy.ops.object.mode_set(mode=saved_mode)
-
-        preferences = \
-            context.preferences.addons[__package__].preferences
-        if preferences.auto_palette_refresh:
-            bpy.ops.color_plus.refresh_palette_outliner()
         return {'FINISHED'}
 
 
@@ -580,29 +865,30 @@ class COLORPLUS_OT_convert_to_vertex_group(DefaultsOperator):
     bl_label = "Convert to Vertex Group"
 
     def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors
+        from .colorspace import color_keys
+        from .topology import get_topology
+
         ob = context.object
         saved_mode = ob.mode
+        # NOTE: Vertex groups can only be filled in object mode
         bpy.ops.object.mode_set(mode='OBJECT')
 
         palette = ob.color_palette[ob.color_palette_active]
-        palette_color = iterable_to_list(palette.color)
-
-        # Object mode BMesh for vgroup add (only works in ob mode)
-        bm = bmesh.new()
-        bm.from_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
+        active_color = get_active_color(ob.data)
+        if active_color is None:
+            bpy.ops.object.mode_set(mode=saved_mode)
+            return {'CANCELLED'}
 
         # Get vertices with the corresponding color value
-        vert_indices = []
-        for component, color in components.items():
-            if layer_type == 'loop':
-                index = component.vert.index
-            else: # Vert
-                index = component.index
-            if index in vert_indices or color != palette_color:
-                continue
-            vert_indices.append(index)
+        colors = read_colors(active_color)
+        matched = color_keys(colors) == color_keys(np.array(palette.color))
+        if active_color.domain == 'CORNER':
+            loop_vertex_indices = get_topology(ob.data).loop_vertex_indices
+            vert_indices = np.unique(loop_vertex_indices[matched]).tolist()
+        else: # Point
+            vert_indices = np.flatnonzero(matched).tolist()
 
         converted_vgroup = ob.vertex_groups.new(name=palette.name)
         converted_vgroup.add(vert_indices, 1.0, 'ADD')
@@ -616,7 +902,7 @@ class COLORPLUS_OT_custom_color_apply(DefaultsOperator):
     bl_idname = "color_plus.custom_color_apply"
     bl_options = {'INTERNAL'}
 
-    custom_color_name: bpy.props.StringProperty(options={'HIDDEN'})
+    index: bpy.props.IntProperty(options={'HIDDEN'})
 
     @classmethod
     def poll(cls, context: Context):
@@ -628,23 +914,232 @@ class COLORPLUS_OT_custom_color_apply(DefaultsOperator):
 
     def execute(self, context: Context):
         color_plus = context.scene.color_plus
+        swatches = context.scene.color_plus_swatches
+        if not 0 <= self.index < len(swatches):
+            return {'CANCELLED'}
+        context.scene.color_plus_swatches_active = self.index
+
         if color_plus.custom_apply_option == 'apply_to_sel':
             bpy.ops.color_plus.edit_color(
                 edit_type='apply', variation_value="",
-                custom_color_name=self.custom_color_name
+                custom_color_index=self.index
             )
         elif color_plus.custom_apply_option == 'apply_to_sel_rgb':
             bpy.ops.color_plus.edit_color(
                 edit_type='apply', variation_value="color_only",
-                custom_color_name=self.custom_color_name
+                custom_color_index=self.index
             )
         elif color_plus.custom_apply_option == 'apply_to_sel_alpha':
             bpy.ops.color_plus.edit_color(
                 edit_type='apply', variation_value="alpha_only",
-                custom_color_name=self.custom_color_name
+                custom_color_index=self.index
             )
         else: # Set color
-            color_plus.color_wheel = getattr(color_plus, self.custom_color_name)
+            color_plus.color_wheel = swatches[self.index].color
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_add_swatch(DefaultsOperator):
+    """Add the active color to the Customizable Palette"""
+    bl_idname = "color_plus.add_swatch"
+
+    def execute(self, context: Context):
+        scene = context.scene
+        swatches = scene.color_plus_swatches
+        swatch = swatches.add()
+        swatch.color = scene.color_plus.color_wheel
+
+        # NOTE: Insert after the active swatch
+        idx = min(scene.color_plus_swatches_active + 1, len(swatches) - 1)
+        swatches.move(len(swatches) - 1, idx)
+        scene.color_plus_swatches_active = idx
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_remove_swatch(DefaultsOperator):
+    """Remove the active swatch from the Customizable Palette"""
+    bl_idname = "color_plus.remove_swatch"
+
+    @classmethod
+    def poll(cls, context: Context):
+        return len(context.scene.color_plus_swatches) > 0
+
+    def execute(self, context: Context):
+        scene = context.scene
+        swatches = scene.color_plus_swatches
+        idx = min(scene.color_plus_swatches_active, len(swatches) - 1)
+        swatches.remove(idx)
+        scene.color_plus_swatches_active = max(idx - 1, 0)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_reset_custom_palette(DefaultsOperator):
+    """Replace the Customizable Palette with the default colors"""
+    bl_idname = "color_plus.reset_custom_palette"
+    bl_label = "Reset Palette"
+
+    def invoke(self, context: Context, event):
+        if not len(context.scene.color_plus_swatches):
+            return self.execute(context)
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context: Context):
+        from .preferences import fill_custom_palette
+
+        fill_custom_palette(context.scene, DEFAULT_CUSTOM_PALETTE)
+        context.scene.color_plus.property_unset('custom_palette_name')
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_load_palette(DefaultsOperator):
+    """Load a palette file (JSON, GIMP, Adobe Swatch Exchange or legacy preset) into the Customizable Palette"""
+    bl_idname = "color_plus.load_palette"
+    bl_label = "Load Palette"
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(
+        default="*.json;*.gpl;*.ase;*.py", options={'HIDDEN'}
+    )
+
+    def invoke(self, context: Context, event):
+        if not self.filepath:
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
+
+    def execute(self, context: Context):
+        from .palette_io import read_palette, PaletteFileError
+        from .preferences import fill_custom_palette
+
+        try:
+            palette = read_palette(bpy.path.abspath(self.filepath))
+        except (OSError, PaletteFileError) as error:
+            self.report({'ERROR'}, f"Could not read the palette: {error}")
+            return {'CANCELLED'}
+
+        fill_custom_palette(
+            context.scene, palette.colors, palette.swatch_names
+        )
+        context.scene.color_plus.custom_palette_name = palette.name
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_palette_from_image(DefaultsOperator):
+    """Fill the Customizable Palette with the dominant colors of an image"""
+    bl_idname = "color_plus.palette_from_image"
+    bl_label = "Palette from Image"
+
+    image_name: bpy.props.StringProperty(name="Image")
+    color_count: bpy.props.IntProperty(
+        name="Colors",
+        description="The maximum number of swatches to extract",
+        default=16,
+        min=1,
+        soft_max=64,
+        max=256
+    )
+    method: bpy.props.EnumProperty(
+        name="Method",
+        items=(
+            ('CLUSTER', "Clustered", "Cluster the image colors & use the average color of each cluster"),
+            ('TOP', "Most Common", "Use the most common colors (quantized to 5 bits per channel)")
+        )
+    )
+
+    def invoke(self, context: Context, event):
+        if self.image_name not in bpy.data.images and bpy.data.images:
+            self.image_name = bpy.data.images[0].name
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, _context: Context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop_search(self, 'image_name', bpy.data, 'images')
+        layout.prop(self, 'color_count')
+        layout.prop(self, 'method')
+
+    def execute(self, context: Context):
+        from .images import sample_image_colors
+        from .palette import extract_palette
+        from .preferences import fill_custom_palette
+
+        image = bpy.data.images.get(self.image_name)
+        if image is None:
+            self.report({'ERROR'}, "Choose an image")
+            return {'CANCELLED'}
+        try:
+            colors = sample_image_colors(image)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        palette = extract_palette(colors, self.color_count, self.method)
+        if not len(palette):
+            self.report({'WARNING'}, "The image is fully transparent")
+            return {'CANCELLED'}
+
+        fill_custom_palette(context.scene, palette.tolist())
+        context.scene.color_plus.custom_palette_name = image.name
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_save_palette(DefaultsOperator):
+    """Save the Customizable Palette to the palette library"""
+    bl_idname = "color_plus.save_palette"
+    bl_label = "Save Palette"
+    bl_options = {'REGISTER'}
+
+    name: bpy.props.StringProperty(name="Name")
+
+    def invoke(self, context: Context, event):
+        self.name = context.scene.color_plus.custom_palette_name
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context: Context):
+        from .palette_io import get_palette_filepath, write_json
+
+        if not self.name.strip():
+            self.report({'ERROR'}, "The palette needs a name")
+            return {'CANCELLED'}
+
+        color_plus = context.scene.color_plus
+        color_plus.custom_palette_name = self.name
+        filepath = get_palette_filepath(self.name)
+        try:
+            write_json(filepath, get_custom_palette(context.scene))
+        except OSError as error:
+            self.report({'ERROR'}, f"Could not save the palette: {error}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Saved palette to {filepath}")
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_export_palette(Operator, ExportHelper):
+    """Export the Customizable Palette as a JSON or GIMP (.gpl) palette"""
+    bl_idname = "color_plus.export_palette"
+    bl_label = "Export Palette"
+
+    filename_ext = ".json"
+    check_extension = None # NOTE: Allow .gpl too
+    filter_glob: bpy.props.StringProperty(
+        default="*.json;*.gpl", options={'HIDDEN'}
+    )
+
+    def execute(self, context: Context):
+        import os
+
+        from .palette_io import write_palette, WRITERS
+
+        filepath = self.filepath
+        if os.path.splitext(filepath)[1].lower() not in WRITERS:
+            filepath += self.filename_ext
+        try:
+            write_palette(
+                filepath, get_custom_palette(context.scene)
+            )
+        except OSError as error:
+            self.report({'ERROR'}, f"Could not export the palette: {error}")
+            return {'CANCELLED'}
         return {'FINISHED'}
 
 
@@ -665,6 +1160,11 @@ class COLORPLUS_OT_apply_color_to_border(DefaultsOperator):
         return context.mode == 'EDIT_MESH'
 
     def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors
+        from .selection import get_selection
+        from .topology import get_topology
+
         color_plus = context.scene.color_plus
         saved_mode=context.object.mode
 
@@ -674,50 +1174,44 @@ class COLORPLUS_OT_apply_color_to_border(DefaultsOperator):
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
         for ob in selected_mesh_objects:
-            if get_active_color(ob.data) is None:
-                create_color(ob.data)
-
-            bm = bmesh.new()
-            bm.from_mesh(ob.data)
-            layer, _layer_type = get_bmesh_active_color(bm, ob.data)
-
-            # Get border vertices & linked faces
-            border_vertices = set([])
-            linked_faces = []
-            for edge in [edge for edge in bm.edges if edge.select]:
-                if edge.is_boundary \
-                or edge.link_faces[0].select != edge.link_faces[1].select:
-                    for vert in edge.verts:
-                        if vert.index not in border_vertices:
-                            border_vertices.add(vert.index)
-                    linked_faces.extend(list(edge.link_faces))
-
-            # Search linked faces for loops on
-            # the correct sides of the vertices
-            if self.border_type == 'inner':
-                for face in linked_faces:
-                    if not face.select:
-                        continue
-                    for loop in face.loops:
-                        if loop.vert.index in border_vertices:
-                            loop[layer] = color_plus.color_wheel
-            else: # NOTE: Outer
-                for face in linked_faces:
-                    if face.select:
-                        continue
-                    for loop in face.loops:
-                        if loop.vert.index in border_vertices:
-                            loop[layer] = color_plus.color_wheel
-            bm.to_mesh(ob.data)
+            active_color = get_active_color(ob.data)
+            if active_color is None:
+                active_color = create_color(ob.data)
 
-        bpy.ops.object.mode_set(mode=saved_mode)
+            topology = get_topology(ob.data)
+            selection = get_selection(ob.data, topology)
 
-        preferences = \
-            context.preferences.addons[__package__].preferences
-        if preferences.auto_palette_refresh:
-            bpy.ops.color_plus.refresh_palette_outliner(
-                color=color_plus.color_wheel
+            # Get border vertices & linked faces, a border is a selected
+            # edge on the mesh boundary or between (un)selected faces
+            selected_faces = selection.edge_selected_faces
+            face_counts = topology.edge_face_counts
+            border_edges = selection.edges & (
+                (face_counts == 1)
+              | ((selected_faces > 0) & (selected_faces < face_counts))
             )
+            border_verts = np.zeros(topology.vert_count, dtype=bool)
+            border_verts[topology.edge_vertices[border_edges].ravel()] = True
+
+            if active_color.domain == 'POINT':
+                mask = border_verts
+            else: # Corner
+                # Search linked faces for loops on
+                # the correct sides of the vertices
+                border_loops = border_edges[topology.loop_edge_indices]
+                linked_faces = np.zeros(len(selection.faces), dtype=bool)
+                linked_faces[topology.loop_face_indices[border_loops]] = True
+                if self.border_type == 'inner':
+                    linked_faces &= selection.faces
+                else: # NOTE: Outer
+                    linked_faces &= ~selection.faces
+                mask = linked_faces[topology.loop_face_indices] \
+                     & border_verts[topology.loop_vertex_indices]
+
+            colors = read_colors(active_color)
+            colors[mask] = color_plus.color_wheel
+            write_colors(active_color, colors)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
         return {'FINISHED'}
 
 
@@ -727,37 +1221,287 @@ class COLORPLUS_OT_dirty_vertex_color(DefaultsOperator):
     bl_label = "Generate VColor"
     bl_options = {'INTERNAL', 'REGISTER', 'UNDO'}
 
-    blur_strength: bpy.props.FloatProperty(default=1.0, name='Blur Strength')
-    blur_iterations: bpy.props.IntProperty(default=1, name='Blur Iterations')
-    clean_angle: bpy.props.FloatProperty(default=3.14159, name='Clean Angle', subtype='ANGLE')
-    dirt_angle: bpy.props.FloatProperty(default=0.0, name='Dirt Angle')
+    blur_strength: bpy.props.FloatProperty(
+        default=1.0, min=.01, max=1, name='Blur Strength'
+    )
+    blur_iterations: bpy.props.IntProperty(
+        default=1, min=0, max=40, name='Blur Iterations'
+    )
+    clean_angle: bpy.props.FloatProperty(
+        default=3.14159, min=0, max=3.14159,
+        name='Clean Angle', subtype='ANGLE'
+    )
+    dirt_angle: bpy.props.FloatProperty(
+        default=0.0, min=0, max=3.14159,
+        name='Dirt Angle', subtype='ANGLE'
+    )
     dirt_only: bpy.props.BoolProperty(default=False, name='Dirt Only')
     normalize: bpy.props.BoolProperty(default=True, name='Normalize')
     selection_only: bpy.props.BoolProperty(default=False, name='Use Selection')
 
     def execute(self, context: Context):
-        if not bpy.ops.paint.vertex_paint_toggle.poll():
-            self.report({'ERROR'}, "Could not switch to Vertex Paint mode")
-            return {'CANCELLED'}
+        import numpy as np
+        from .attributes import read_colors, write_colors
+        from .colorspace import quantize_byte, srgb_to_linear, linear_to_srgb
+        from .generators import dirt_tones
+        from .topology import get_topology
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        for data in get_selected_meshes(context):
+            vert_count = len(data.vertices)
+            points = np.empty(vert_count * 3, dtype=np.float32)
+            data.vertices.foreach_get("co", points)
+            normals = np.empty(vert_count * 3, dtype=np.float32)
+            data.vertices.foreach_get("normal", normals)
+
+            topology = get_topology(data)
+            tones = dirt_tones(
+                points.reshape(-1, 3), normals.reshape(-1, 3),
+                topology.vertex_adjacency,
+                self.blur_strength, self.blur_iterations,
+                self.clean_angle, self.dirt_angle,
+                self.dirt_only, self.normalize
+            )
+
+            active_color = get_active_color(data)
+            if active_color is None:
+                active_color = create_color(data)
+
+            if active_color.domain == 'CORNER':
+                tones = tones[topology.loop_vertex_indices]
+
+            # NOTE: Like the paint mask, selection is face based
+            mask = np.ones(len(tones), dtype=bool)
+            if self.selection_only and active_color.domain == 'CORNER':
+                face_select = np.empty(len(data.polygons), dtype=bool)
+                data.polygons.foreach_get("select", face_select)
+                mask = np.repeat(face_select, topology.face_loop_totals)
+            elif self.selection_only: # Point
+                data.vertices.foreach_get("select", mask)
+
+            # NOTE: Darken in linear space so the amount of
+            # dirt doesn't depend on the color it darkens
+            colors = read_colors(active_color)
+            dirty = srgb_to_linear(colors[mask])
+            dirty[:, :3] *= tones[mask, None]
+            dirty = linear_to_srgb(dirty)
+            if active_color.data_type == 'BYTE_COLOR':
+                dirty = quantize_byte(dirty)
+            colors[mask] = dirty
+            write_colors(active_color, colors)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_smooth_color(DefaultsOperator):
+    """Soften color transitions by averaging colors with neighboring vertices"""
+    bl_idname = "color_plus.smooth_color"
+    bl_label = "Smooth Colors"
+
+    iterations: bpy.props.IntProperty(
+        default=1, min=1, max=200, name='Iterations'
+    )
+    factor: bpy.props.FloatProperty(
+        default=.5, min=0, max=1, name='Factor', subtype='FACTOR'
+    )
+    selection_only: bpy.props.BoolProperty(
+        default=True, name='Selection Only'
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None and context.object.type == 'MESH'
+
+    def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors
+        from .colorspace import quantize_byte
+        from .topology import (
+            get_topology,
+            smooth_vertex_values,
+            smooth_corner_values
+        )
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        for data in get_selected_meshes(context):
+            active_color = get_active_color(data)
+            if active_color is None:
+                continue
+
+            mask = None
+            if self.selection_only:
+                mask = np.empty(len(data.vertices), dtype=bool)
+                data.vertices.foreach_get("select", mask)
+                if not mask.any():
+                    continue
 
-        saved_mode=context.mode
+            topology = get_topology(data)
+            adjacency = topology.vertex_adjacency
+            colors = read_colors(active_color)
+            if active_color.domain == 'CORNER':
+                loop_vertex_indices = topology.loop_vertex_indices
+                if mask is not None:
+                    mask = mask[loop_vertex_indices]
+                colors = smooth_corner_values(
+                    colors, loop_vertex_indices, adjacency,
+                    self.iterations, self.factor, mask
+                )
+            else: # Point
+                colors = smooth_vertex_values(
+                    colors, adjacency, self.iterations, self.factor, mask
+                )
+            if active_color.data_type == 'BYTE_COLOR':
+                colors = quantize_byte(colors)
+            write_colors(active_color, colors)
 
-        context.object.data.use_paint_mask = self.selection_only
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_quantize_colors(DefaultsOperator):
+    """Reduce the colors of the active color attribute of all selected objects to a limited palette"""
+    bl_idname = "color_plus.quantize_colors"
+    bl_label = "Quantize Colors"
+
+    color_count: bpy.props.IntProperty(
+        name="Colors", default=16, min=2, max=256
+    )
+    color_space: bpy.props.EnumProperty(
+        name="Color Space",
+        items=(
+            ('RGB', "RGB", "Cluster colors by their sRGB values"),
+            ('LAB', "Lab", "Cluster colors perceptually, in CIE Lab")
+        ),
+        default='LAB'
+    )
+    shared_palette: bpy.props.BoolProperty(
+        name="Shared Palette",
+        description="Quantize all selected objects to one common palette instead of one palette each",
+        default=True
+    )
+
+    def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors
+        from .colorspace import quantize_byte
+        from .palette import quantize_colors
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        attributes = []
+        for data in get_selected_meshes(context):
+            active_color = get_active_color(data)
+            if active_color is not None:
+                attributes.append(active_color)
+        buffers = [read_colors(attribute) for attribute in attributes]
+
+        if self.shared_palette and buffers:
+            # Quantize everything at once, then split per mesh
+            sizes = np.cumsum([len(colors) for colors in buffers])[:-1]
+            buffers = np.split(
+                quantize_colors(
+                    np.concatenate(buffers), self.color_count, self.color_space
+                ), sizes
+            )
+        else:
+            buffers = [
+                quantize_colors(colors, self.color_count, self.color_space)
+                for colors in buffers
+            ]
 
-        if context.mode != 'PAINT_VERTEX':
-            bpy.ops.paint.vertex_paint_toggle()
+        for attribute, colors in zip(attributes, buffers):
+            if attribute.data_type == 'BYTE_COLOR':
+                colors = quantize_byte(colors)
+            write_colors(attribute, colors)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
 
-        bpy.ops.paint.vertex_color_dirt(
-            blur_strength=self.blur_strength,
-            blur_iterations=self.blur_iterations,
-            clean_angle=self.clean_angle,
-            dirt_angle=self.dirt_angle,
-            dirt_only=self.dirt_only,
-            normalize=self.normalize
+
+class COLORPLUS_OT_sample_image_colors(DefaultsOperator):
+    """Sample an image through the active UV map into the active color attribute of all selected objects"""
+    bl_idname = "color_plus.sample_image_colors"
+    bl_label = "Sample Image"
+
+    selection_only: bpy.props.BoolProperty(
+        default=False, name='Selection Only'
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None and context.object.type == 'MESH' \
+        and context.scene.color_plus.sample_image is not None
+
+    def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors, corner_to_point
+        from .colorspace import linear_to_srgb, quantize_byte
+        from .images import (
+            read_pixels,
+            is_linear,
+            to_rgba,
+            sample_corner_colors
         )
+        from .selection import get_selection
+        from .topology import get_topology
 
-        if saved_mode != 'PAINT_VERTEX':
-            bpy.ops.object.editmode_toggle()
+        color_plus = context.scene.color_plus
+        image = color_plus.sample_image
+        try:
+            pixels = read_pixels(image)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        skipped = 0
+        try:
+            for data in get_selected_meshes(context):
+                active_color = get_active_color(data)
+                if active_color is None or data.uv_layers.active is None:
+                    skipped += 1
+                    continue
+
+                uvs = np.empty(len(data.loops) * 2, dtype=np.float32)
+                data.uv_layers.active.uv.foreach_get("vector", uvs)
+                uvs = uvs.reshape(-1, 2)
+
+                topology = get_topology(data)
+                colors = to_rgba(sample_corner_colors(
+                    pixels, uvs, topology, color_plus.sample_supersampling
+                ))
+                if is_linear(image):
+                    colors = linear_to_srgb(colors)
+                if active_color.domain == 'POINT':
+                    colors = corner_to_point(
+                        colors, topology.loop_vertex_indices, topology.vert_count
+                    )
+
+                if self.selection_only:
+                    mask = get_selection(data, topology) \
+                        .domain_mask(active_color.domain)
+                    existing = read_colors(active_color)
+                    existing[mask] = colors[mask]
+                    colors = existing
+
+                if active_color.data_type == 'BYTE_COLOR':
+                    colors = quantize_byte(colors)
+                write_colors(active_color, colors)
+        finally:
+            bpy.ops.object.mode_set(mode=saved_mode)
+        if skipped:
+            self.report(
+                {'WARNING'},
+                f"Skipped {skipped} object(s) without a color attribute or UV map"
+            )
         return {'FINISHED'}
 
 
@@ -766,128 +1510,304 @@ class COLORPLUS_OT_generate_color(DefaultsOperator):
     bl_idname = "color_plus.generate_color"
     bl_label = "Generate Vertex Color"
 
-    bm = None
-    layer = None
-    uv_islands = None
-
-    def uv_shell(self):
-        for island_idxs in self.uv_islands:
-            random_color = [random(), random(), random(), 1]
-            for face_idx in island_idxs:
-                face = self.bm.faces[face_idx]
-                for loop in face.loops:
-                    loop[self.layer] = random_color
+    def generate(self, data, topology, rng) -> tuple:
+        """Get the generated face corner colors & a mask of corners to set."""
+        import numpy as np
+        from .generators import (
+            random_colors,
+            face_island_indices,
+            uv_border_corners
+        )
 
-    def uv_border(self):
         color_plus = bpy.context.scene.color_plus
-        for island_idxs in self.uv_islands:
-            if color_plus.generate_per_uv_border == 'random_col':
-                random_color = [random(), random(), random(), 1]
-
-            # Get border vertices & linked faces
-            border_vertices = set([])
-            linked_faces = set([])
-            for edge in self.bm.edges:
-                if edge.is_boundary \
-                or (edge.link_faces[0].index in island_idxs \
-                and edge.link_faces[1].index not in island_idxs) \
-                or (edge.link_faces[0].index not in island_idxs \
-                and edge.link_faces[1].index in island_idxs):
-                    for vert in edge.verts:
-                        if vert.index in border_vertices:
-                            continue
-                        border_vertices.add(vert.index)
-                for vert in edge.verts:
-                    if vert.index not in border_vertices:
-                        continue
-                    for face in edge.link_faces:
-                        if face in linked_faces:
-                            continue
-                        linked_faces.add(face)
-
-            # Assign a color to interior loops of linked faces
-            for face in linked_faces:
-                if face.index not in island_idxs:
-                    continue
-                for loop in face.loops:
-                    if loop.vert.index not in border_vertices:
-                        continue
-                    if color_plus.generate_per_uv_border == 'random_col':
-                        loop[self.layer] = random_color
-                    else: # Apply active color
-                        loop[self.layer] = color_plus.color_wheel
-
-    def face(self):
-        for face in self.bm.faces:
-            random_color = [random(), random(), random(), 1]
-            for loop in face.loops:
-                loop[self.layer] = random_color
-
-    def vertex(self):
-        for face in self.bm.faces:
-            random_color = [random(), random(), random(), 1]
-            for loop in face.loops:
-                loop[self.layer] = random_color
-
-                for vert in self.bm.verts:
-                    random_color = [random(), random(), random(), 1]
-                    for loop in vert.link_loops:
-                        loop[self.layer] = random_color
-
-    def point(self):
-        for face in self.bm.faces:
-            for loop in face.loops:
-                random_color = [random(), random(), random(), 1]
-                loop[self.layer] = random_color
+        loop_count = len(topology.loop_vertex_indices)
+        mask = np.ones(loop_count, dtype=bool)
+
+        if color_plus.generate in ('per_uv_shell', 'per_uv_border'):
+            uv_islands = bpy_extras.mesh_utils.mesh_linked_uv_islands(data)
+            face_islands = face_island_indices(
+                uv_islands, len(topology.face_loop_totals)
+            )
+            loop_islands = face_islands[topology.loop_face_indices]
+            colors = random_colors(len(uv_islands), rng)[loop_islands]
+            if color_plus.generate == 'per_uv_border':
+                mask = uv_border_corners(topology, face_islands)
+                if color_plus.generate_per_uv_border == 'active_col':
+                    colors[:] = color_plus.color_wheel
+        elif color_plus.generate == 'per_face':
+            face_count = len(topology.face_loop_totals)
+            colors = \
+                random_colors(face_count, rng)[topology.loop_face_indices]
+        elif color_plus.generate == 'per_vertex':
+            colors = random_colors(topology.vert_count, rng)[
+                topology.loop_vertex_indices
+            ]
+        else: # Per point
+            colors = random_colors(loop_count, rng)
+        return colors, mask
 
     def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors, corner_to_point
+        from .colorspace import quantize_byte
+        from .topology import get_topology
+
         color_plus = context.scene.color_plus
         saved_mode=context.object.mode
 
         bpy.ops.object.mode_set(mode='OBJECT')
         context.object.select_set(True)
 
+        rng = np.random.default_rng()
         no_uv_obs = []
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
         for ob in selected_mesh_objects:
-            if color_plus.generate in ('per_uv_shell', 'per_uv_border'):
-                try:
-                    self.uv_islands = \
-                        bpy_extras.mesh_utils.mesh_linked_uv_islands(ob.data)
-                except AttributeError:
-                    no_uv_obs.append(ob.name)
-                    continue
+            if color_plus.generate in ('per_uv_shell', 'per_uv_border') \
+            and not ob.data.uv_layers:
+                no_uv_obs.append(ob.name)
+                continue
+
+            active_color = get_active_color(ob.data)
+            if active_color is None:
+                active_color = create_color(ob.data)
 
-            if get_active_color(ob.data) is None:
-                create_color(ob.data)
-
-            self.bm = bmesh.new()
-            self.bm.from_mesh(ob.data)
-            self.bm.faces.ensure_lookup_table()
-            self.layer, _layer_type = get_bmesh_active_color(self.bm, ob.data)
-            if color_plus.generate == 'per_uv_shell':
-                self.uv_shell()
-            elif color_plus.generate == 'per_uv_border':
-                self.uv_border()
-            elif color_plus.generate == 'per_face':
-                self.face()
-            elif color_plus.generate == 'per_vertex':
-                self.vertex()
-            elif color_plus.generate == 'per_point':
-                self.point()
-            self.bm.to_mesh(ob.data)
+            topology = get_topology(ob.data)
+            generated, mask = self.generate(ob.data, topology, rng)
+            if active_color.domain == 'POINT':
+                loop_vertex_indices = topology.loop_vertex_indices[mask]
+                generated = corner_to_point(
+                    generated[mask], loop_vertex_indices, topology.vert_count
+                )
+                mask = np.bincount(
+                    loop_vertex_indices, minlength=topology.vert_count
+                ) > 0
+            if active_color.data_type == 'BYTE_COLOR':
+                generated = quantize_byte(generated)
+
+            colors = read_colors(active_color)
+            colors[mask] = generated[mask]
+            write_colors(active_color, colors)
 
         if color_plus.generate in ('per_uv_shell', 'per_uv_border') \
         and no_uv_obs:
             self.report({'INFO'}, f"UVs not found for: {no_uv_obs}")
 
         bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_gradient_color(DefaultsOperator):
+    """Fill with a gradient along an axis or between the last two selected vertices"""
+    bl_idname = "color_plus.gradient_color"
+    bl_label = "Generate Gradient"
+
+    gradient_type: bpy.props.EnumProperty(
+        items=(
+            ('LINEAR', "Linear", "Position along the gradient axis"),
+            ('RADIAL', "Radial", "Distance from the gradient axis"),
+            ('SPHERICAL', "Spherical", "Distance from the gradient origin")
+        ),
+        name="Type"
+    )
+    direction: bpy.props.EnumProperty(
+        items=(
+            ('X', "X", ""),
+            ('Y', "Y", ""),
+            ('Z', "Z", ""),
+            ('PICKED', "Picked Vertices",
+             "From the second to last to the last selected vertex")
+        ),
+        name="Direction",
+        default='Z'
+    )
+    space: bpy.props.EnumProperty(
+        items=(
+            ('WORLD', "World", "Fit the gradient to all selected objects"),
+            ('LOCAL', "Local", "Fit the gradient to each object")
+        ),
+        name="Space"
+    )
+    start_color: FloatVectorProperty(
+        name="Start",
+        subtype='COLOR_GAMMA',
+        default=[0, 0, 0, 1], size=4,
+        min=0, max=1
+    )
+    end_color: FloatVectorProperty(
+        name="End",
+        subtype='COLOR_GAMMA',
+        default=[1, 1, 1, 1], size=4,
+        min=0, max=1
+    )
+    ramp_texture: bpy.props.StringProperty(
+        name="Color Ramp",
+        description=\
+            "Use the color ramp of a texture instead of the start & end colors"
+    )
+    selection_only: bpy.props.BoolProperty(
+        default=True, name='Selection Only'
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None and context.object.type == 'MESH'
+
+    def invoke(self, context: Context, _event):
+        color_plus = context.scene.color_plus
+        self.start_color = color_plus.color_wheel
+        self.end_color = color_plus.alt_color_wheel
+        return self.execute(context)
+
+    def draw(self, _context: Context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, 'gradient_type')
+        layout.prop(self, 'direction')
+        row = layout.row()
+        row.enabled = self.direction != 'PICKED'
+        row.prop(self, 'space')
+        layout.prop_search(self, 'ramp_texture', bpy.data, 'textures')
+        col = layout.column()
+        col.enabled = not self.ramp_texture
+        col.prop(self, 'start_color')
+        col.prop(self, 'end_color')
+        layout.prop(self, 'selection_only')
+
+    def get_picked_points(self, context: Context) -> tuple | None:
+        """Get the world positions of the last two selected vertices."""
+        ob = context.object
+        if ob.mode != 'EDIT':
+            return None
+        bm = bmesh.from_edit_mesh(ob.data)
+        verts = [
+            elem for elem in bm.select_history
+            if isinstance(elem, bmesh.types.BMVert)
+        ]
+        if len(verts) < 2:
+            return None
+        return ob.matrix_world @ verts[-2].co, ob.matrix_world @ verts[-1].co
+
+    def get_ramp_table(self):
+        """Sample the color ramp texture, if any, into a lookup table."""
+        import numpy as np
+        from .colorspace import linear_to_srgb
+
+        texture = bpy.data.textures.get(self.ramp_texture)
+        if texture is None or not texture.use_color_ramp:
+            return None
+        color_ramp = texture.color_ramp
+        ramp_table = np.array(
+            [color_ramp.evaluate(idx / 255) for idx in range(256)],
+            dtype=np.float32
+        )
+        return linear_to_srgb(ramp_table)
 
-        preferences = \
-            context.preferences.addons[__package__].preferences
-        if preferences.auto_palette_refresh:
-            bpy.ops.color_plus.refresh_palette_outliner()
+    def execute(self, context: Context):
+        import numpy as np
+        from .attributes import read_colors, write_colors
+        from .blending import blend_colors
+        from .colorspace import quantize_byte
+        from .topology import get_topology
+        from .generators import (
+            transform_points,
+            gradient_bounds,
+            gradient_factors,
+            interpolate_colors,
+            ramp_colors
+        )
+
+        color_plus = context.scene.color_plus
+
+        picked_points = None
+        if self.direction == 'PICKED':
+            picked_points = self.get_picked_points(context)
+            if picked_points is None:
+                self.report(
+                    {'ERROR'},
+                    "Select two vertices in Edit Mode to pick the gradient"
+                )
+                return {'CANCELLED'}
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Gather the vertex positions & selection of every object
+        targets = []
+        selected_mesh_objects = \
+            [ob for ob in context.selected_objects if ob.type == 'MESH']
+        for ob in selected_mesh_objects:
+            data = ob.data
+            points = np.empty(len(data.vertices) * 3, dtype=np.float32)
+            data.vertices.foreach_get("co", points)
+            points = points.reshape(-1, 3)
+            if picked_points is not None or self.space == 'WORLD':
+                points = transform_points(points, ob.matrix_world)
+            mask = np.ones(len(data.vertices), dtype=bool)
+            if self.selection_only:
+                data.vertices.foreach_get("select", mask)
+            targets.append((ob, points, mask))
+
+        # Fit the gradient
+        if picked_points is not None:
+            start, end = (
+                np.array(point, dtype=np.float32) for point in picked_points
+            )
+            axis = end - start
+            length = float(np.linalg.norm(axis))
+            if length:
+                axis /= length
+            bounds = [(start, length)] * len(targets)
+        else:
+            axis = np.zeros(3, dtype=np.float32)
+            axis['XYZ'.index(self.direction)] = 1
+            if self.space == 'WORLD' and targets:
+                all_points = np.concatenate(
+                    [points[mask] for _ob, points, mask in targets]
+                )
+                bounds = [
+                    gradient_bounds(all_points, axis, self.gradient_type)
+                ] * len(targets)
+            else: # Local
+                bounds = [
+                    gradient_bounds(points[mask], axis, self.gradient_type)
+                    for _ob, points, mask in targets
+                ]
+
+        ramp_table = self.get_ramp_table()
+        for (ob, points, mask), (origin, length) in zip(targets, bounds):
+            if not mask.any():
+                continue
+            active_color = get_active_color(ob.data)
+            if active_color is None:
+                active_color = create_color(ob.data)
+
+            factors = gradient_factors(
+                points, origin, axis, length, self.gradient_type
+            )
+            if ramp_table is not None:
+                gradient = ramp_colors(factors, ramp_table)
+            else:
+                gradient = interpolate_colors(
+                    factors, self.start_color, self.end_color
+                )
+            if active_color.domain == 'CORNER':
+                loop_vertex_indices = \
+                    get_topology(ob.data).loop_vertex_indices
+                gradient = gradient[loop_vertex_indices]
+                mask = mask[loop_vertex_indices]
+
+            colors = read_colors(active_color)
+            blended = blend_colors(
+                colors[mask], gradient[mask],
+                color_plus.blend_mode, color_plus.blend_opacity
+            )
+            if active_color.data_type == 'BYTE_COLOR':
+                blended = quantize_byte(blended)
+            colors[mask] = blended
+            write_colors(active_color, colors)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
         return {'FINISHED'}
 
 
@@ -903,19 +1823,37 @@ classes = (
     COLORPLUS_OT_active_color_switch,
     COLORPLUS_OT_interpolation_switch,
     COLORPLUS_OT_set_color_from_active,
+    COLORPLUS_OT_color_statistics,
+    COLORPLUS_OT_use_color_statistic,
     COLORPLUS_OT_apply_attribute_shading,
     COLORPLUS_OT_remove_all_vertex_color,
+    COLORPLUS_OT_convert_color_attribute,
+    COLORPLUS_OT_sync_color_attributes,
     COLORPLUS_OT_refresh_palette_outliner,
+    COLORPLUS_OT_refresh_scene_palette,
+    COLORPLUS_OT_select_scene_palette_objects,
     COLORPLUS_OT_change_outliner_color,
+    COLORPLUS_OT_remap_colors,
     COLORPLUS_OT_get_active_outliner_color,
     COLORPLUS_OT_apply_outliner_color,
     COLORPLUS_OT_select_outliner_color,
     COLORPLUS_OT_delete_outliner_color,
     COLORPLUS_OT_convert_to_vertex_group,
     COLORPLUS_OT_custom_color_apply,
+    COLORPLUS_OT_add_swatch,
+    COLORPLUS_OT_remove_swatch,
+    COLORPLUS_OT_reset_custom_palette,
+    COLORPLUS_OT_load_palette,
+    COLORPLUS_OT_palette_from_image,
+    COLORPLUS_OT_save_palette,
+    COLORPLUS_OT_export_palette,
     COLORPLUS_OT_apply_color_to_border,
     COLORPLUS_OT_dirty_vertex_color,
-    COLORPLUS_OT_generate_color
+    COLORPLUS_OT_smooth_color,
+    COLORPLUS_OT_quantize_colors,
+    COLORPLUS_OT_sample_image_colors,
+    COLORPLUS_OT_generate_color,
+    COLORPLUS_OT_gradient_color
 )
 
 def register():
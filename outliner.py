@@ -0,0 +1,634 @@
+"""Palette Outliner model, swatch editing & the scene palette index.
+
+Rebuilding a palette reads the whole color attribute, so swatch edits
+made with the color picker never rebuild on every tick. Instead the
+elements using the edited color are found once when an edit starts,
+picker ticks are coalesced by a timer that recolors only those
+elements, and the palette is rebuilt a single time once the
+interaction ends.
+
+Palettes are invalidated by depsgraph updates of their mesh & rebuilt
+lazily when the Palette Outliner is drawn, once updates have settled
+for `PALETTE_REFRESH_DELAY` seconds, so edits from any tool are picked
+up while continuous painting never rescans the mesh mid-stroke.
+"""
+
+
+import time
+import colorsys
+
+import bpy
+import bmesh
+from bpy.app.handlers import persistent
+from bpy.types import Object, Mesh
+
+from .functions import get_active_color, get_bmesh_active_color
+
+
+# Seconds between applying queued swatch edits
+SWATCH_EDIT_INTERVAL = .02
+# Seconds without picker ticks after which an edit is finished
+SWATCH_EDIT_IDLE = .4
+# Seconds without mesh updates before a palette is rebuilt
+PALETTE_REFRESH_DELAY = .5
+
+# Mesh pointers with changed geometry/colors since their
+# histogram (scene palette) or palette (outliner) was built
+_dirty_meshes = set()
+_dirty_palettes = set()
+# Signatures of meshes tagged for an update by this module (reading
+# edit meshes), their next update is not a change if they still match
+_self_updates = {}
+
+
+def format_color_name(color, convert_option: str='rgb') -> str:
+    """Get the Palette Outliner label of a color."""
+    from .colorspace import float_to_byte
+
+    item_color = []
+    if convert_option == 'rgb':
+        item_color.extend(
+            int(channel) for channel in float_to_byte(color[:3])
+        )
+    else: # HSV
+        color_hsv = colorsys.rgb_to_hsv(color[0], color[1], color[2])
+        for channel in color_hsv:
+            if channel.is_integer():
+                channel = round(channel)
+            item_color.append(round(channel, 2))
+    if color[3].is_integer():
+        alpha_channel = round(color[3])
+    else:
+        alpha_channel = round(color[3], 3)
+    item_color.append(alpha_channel)
+    return "({}, {}, {}, {})".format(*item_color)
+
+
+def get_update_signature(data: Mesh) -> tuple:
+    """Get a signature of a mesh's geometry & active color,
+    including a checksum of the color values."""
+    import numpy as np
+    from .topology import checksum
+
+    active_color = get_active_color(data)
+    if active_color is None:
+        return len(data.vertices), len(data.polygons), None
+    values = np.empty(len(active_color.data) * 4, dtype=np.float32)
+    active_color.data.foreach_get("color", values)
+    return (
+        len(data.vertices), len(data.polygons), active_color.name,
+        active_color.domain, active_color.data_type, checksum(values)
+    )
+
+
+def read_object_colors(ob: Object):
+    """Read the active color attribute of an object in any mode."""
+    from .attributes import read_colors
+
+    active_color = get_active_color(ob.data)
+    if active_color is None:
+        return None
+    if ob.mode == 'EDIT':
+        # NOTE: Syncs the edit mesh without leaving Edit Mode
+        ob.update_from_editmode()
+        _self_updates[ob.data.as_pointer()] = get_update_signature(ob.data)
+        active_color = get_active_color(ob.data)
+    return read_colors(active_color)
+
+
+class PaletteModel:
+    """Unique colors of a mesh (in order of first use) & their counts.
+
+    Kept apart from the Palette Outliner items, so display
+    options only re-render these without reading the mesh."""
+    __slots__ = ("colors", "counts")
+
+    def __init__(self, colors, counts):
+        self.colors = colors
+        self.counts = counts
+
+
+def build_palette_model(colors) -> PaletteModel:
+    """Build a palette model from a color buffer, blank (white)
+    colors are skipped."""
+    import numpy as np
+    from .colorspace import color_keys
+    from .constants import BLANK_ARRAY
+
+    keys = color_keys(colors)
+    unique_keys, first, counts = \
+        np.unique(keys, return_index=True, return_counts=True)
+    used = unique_keys != color_keys(np.array(BLANK_ARRAY))
+    first, counts = first[used], counts[used]
+    order = np.argsort(first)
+    return PaletteModel(colors[first[order]], counts[order])
+
+
+# Palette models by mesh pointer
+_palette_models = {}
+
+
+def get_palette_model(ob: Object, rescan: bool=False) -> PaletteModel | None:
+    """Get the (cached) palette model of an object's mesh.
+
+    The mesh is only read if it changed since the model was built."""
+    key = ob.data.as_pointer()
+    model = _palette_models.get(key)
+    if model is not None and not rescan and key not in _dirty_palettes:
+        return model
+
+    _dirty_palettes.discard(key)
+    colors = read_object_colors(ob)
+    if colors is None:
+        _palette_models.pop(key, None)
+        return None
+    model = _palette_models[key] = build_palette_model(colors)
+    return model
+
+
+def sort_palette(model: PaletteModel, sort_type: str):
+    """Get the display order of a palette model's colors."""
+    import numpy as np
+    from .palette import rgb_to_hsv
+
+    if sort_type == 'COUNT':
+        return np.argsort(-model.counts, kind='stable')
+    if sort_type == 'HUE':
+        # Grays first (by value), then by hue
+        hsv = rgb_to_hsv(model.colors)
+        return np.lexsort((hsv[:, 2], hsv[:, 0], hsv[:, 1] > 0))
+    if sort_type == 'VALUE':
+        return np.argsort(rgb_to_hsv(model.colors)[:, 2], kind='stable')
+    return np.arange(len(model.colors))
+
+
+def render_palette(
+        ob: Object, model: PaletteModel | None=None,
+        saved_active_idx: int=-1
+    ) -> None:
+    """Fill the Palette Outliner items of an object from its model.
+
+    Only formats, sorts & filters the cached colors, the active
+    item keeps pointing at the same color if it still exists."""
+    color_plus = bpy.context.scene.color_plus
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    if model is None:
+        model = get_palette_model(ob)
+
+    saved_color = None
+    if 0 <= ob.color_palette_active < len(ob.color_palette):
+        saved_color = [*ob.color_palette[ob.color_palette_active].color]
+    ob.color_palette.clear()
+    if model is None:
+        return
+
+    order = sort_palette(model, color_plus.palette_sort)
+    order = order[model.counts[order] >= color_plus.palette_min_count]
+    order = order[:preferences.max_outliner_items + 1]
+    colors = model.colors[order].tolist()
+    for idx, (color, count) in enumerate(
+            zip(colors, model.counts[order].tolist())
+        ):
+        item = ob.color_palette.add()
+        item.saved_color = color
+        item.color = color
+        item.id = idx
+        item.count = count
+        item.name = format_color_name(color, color_plus.rgb_hsv_convert_options)
+
+    if saved_active_idx != -1 and saved_active_idx < len(colors):
+        ob.color_palette_active = saved_active_idx
+    elif saved_color is not None:
+        for item in ob.color_palette:
+            if [round(channel, 3) for channel in item.color] \
+            == [round(channel, 3) for channel in saved_color]:
+                ob.color_palette_active = item.id
+                break
+
+
+def rebuild_palette(ob: Object, saved_active_idx: int=-1) -> None:
+    """Re-read the active color of an object & rebuild its Palette Outliner."""
+    render_palette(ob, get_palette_model(ob, rescan=True), saved_active_idx)
+
+
+#########################################
+# SWATCH EDITING
+#########################################
+
+
+class SwatchEdit:
+    """An in-progress color picker edit of one Palette Outliner item.
+
+    Holds the attribute indices that used the color when the edit
+    started, never Blender data. The object, mesh & BMesh are looked
+    up again on every tick."""
+
+    def __init__(self, ob: Object, palette_id: int):
+        self.object_name = ob.name
+        self.mesh_pointer = ob.data.as_pointer()
+        self.palette_id = palette_id
+        self.indices = None
+        self.face_indices = None
+        self.offsets = None
+        self.colors = None
+        self.pending = True
+        self.last_tick = time.monotonic()
+
+    def find_elements(self, ob: Object, palette) -> None:
+        """Find the elements using the color being edited (once)."""
+        import numpy as np
+        from .colorspace import color_keys
+        from .topology import get_topology
+
+        colors = read_object_colors(ob)
+        if colors is None:
+            self.indices = np.zeros(0, dtype=np.int64)
+            return
+        self.indices = np.flatnonzero(
+            color_keys(colors) == color_keys(np.array(palette.saved_color))
+        )
+        if ob.mode != 'EDIT':
+            self.colors = colors
+            return
+
+        # Edit mesh corners are addressed by face & offset in the face
+        topology = get_topology(ob.data)
+        self.face_indices = topology.loop_face_indices[self.indices].tolist()
+        self.offsets = (
+            self.indices - topology.face_loop_starts[self.face_indices]
+        ).tolist()
+
+    def get_edit_elements(self, bm, layer_type: str) -> list:
+        if layer_type == "vert":
+            bm.verts.ensure_lookup_table()
+            return [bm.verts[idx] for idx in self.indices.tolist()]
+        bm.faces.ensure_lookup_table()
+        return [
+            bm.faces[face_idx].loops[offset]
+            for face_idx, offset in zip(self.face_indices, self.offsets)
+        ]
+
+    def apply(self, ob: Object, palette) -> None:
+        """Recolor only the elements found when the edit started."""
+        import numpy as np
+        from .attributes import write_colors
+        from .colorspace import srgb_to_linear, quantize_byte
+
+        if self.indices is None:
+            self.find_elements(ob, palette)
+        color = palette.color
+        if ob.mode == 'EDIT' and self.colors is None:
+            bm = bmesh.from_edit_mesh(ob.data)
+            layer, layer_type = get_bmesh_active_color(bm, ob.data)
+            if layer is None:
+                return
+            try:
+                elements = self.get_edit_elements(bm, layer_type)
+            except IndexError: # NOTE: Geometry changed mid edit
+                return
+            # NOTE: Float layers store linear colors, byte
+            # layers sRGB colors in 1/255 steps
+            color = np.array([color], dtype=np.float32)
+            if get_active_color(ob.data).data_type == 'FLOAT_COLOR':
+                color = srgb_to_linear(color)
+            else:
+                color = quantize_byte(color)
+            color = color[0].tolist()
+            for element in elements:
+                element[layer] = color
+            bmesh.update_edit_mesh(
+                ob.data, loop_triangles=False, destructive=False
+            )
+        elif ob.mode != 'EDIT' and self.colors is not None:
+            active_color = get_active_color(ob.data)
+            if active_color is None \
+            or len(active_color.data) != len(self.colors):
+                return
+            self.colors[self.indices] = color
+            write_colors(active_color, self.colors)
+            ob.data.update()
+
+    def finish(self, ob: Object, palette) -> None:
+        palette.saved_color = palette.color
+        rebuild_palette(ob, self.palette_id)
+        push_undo("Change Outliner Color")
+
+
+def push_undo(message: str) -> None:
+    """Push an undo step for edits made outside of an operator."""
+    window_manager = bpy.context.window_manager
+    if window_manager is None or not window_manager.windows:
+        return
+    with bpy.context.temp_override(window=window_manager.windows[0]):
+        bpy.ops.ed.undo_push(message=message)
+
+
+_swatch_edits = {}
+
+
+def get_palette_item(ob: Object, palette_id: int):
+    for palette in ob.color_palette:
+        if palette.id == palette_id:
+            return palette
+    return None
+
+
+def queue_swatch_edit(ob: Object, palette_id: int) -> None:
+    """Queue a color picker tick, applied by `apply_swatch_edits`."""
+    key = (ob.name, palette_id)
+    edit = _swatch_edits.get(key)
+    if edit is None:
+        edit = _swatch_edits[key] = SwatchEdit(ob, palette_id)
+    edit.pending = True
+    edit.last_tick = time.monotonic()
+    if not bpy.app.timers.is_registered(apply_swatch_edits):
+        bpy.app.timers.register(
+            apply_swatch_edits, first_interval=SWATCH_EDIT_INTERVAL
+        )
+
+
+def apply_swatch_edits() -> float | None:
+    """Timer applying the latest color of every queued swatch edit."""
+    now = time.monotonic()
+    for key, edit in list(_swatch_edits.items()):
+        ob = bpy.data.objects.get(edit.object_name)
+        palette = None
+        if ob is not None and ob.type == 'MESH' \
+        and ob.data.as_pointer() == edit.mesh_pointer:
+            palette = get_palette_item(ob, edit.palette_id)
+        if palette is None:
+            del _swatch_edits[key]
+            continue
+
+        if edit.pending:
+            edit.pending = False
+            edit.apply(ob, palette)
+        elif now - edit.last_tick > SWATCH_EDIT_IDLE:
+            del _swatch_edits[key]
+            edit.finish(ob, palette)
+    if not _swatch_edits:
+        return None
+    return SWATCH_EDIT_INTERVAL
+
+
+#########################################
+# SCENE PALETTE
+#########################################
+
+
+class MeshHistogram:
+    """Sorted unique color keys of a mesh's active color & their counts."""
+    __slots__ = ("signature", "keys", "counts")
+
+    def __init__(self, signature: tuple, keys, counts):
+        self.signature = signature
+        self.keys = keys
+        self.counts = counts
+
+
+# Histograms by mesh pointer, only meshes reported
+# as changed (see `on_depsgraph_update`) are re-read
+_mesh_histograms = {}
+
+
+def get_histogram_signature(data: Mesh) -> tuple | None:
+    active_color = get_active_color(data)
+    if active_color is None:
+        return None
+    return (
+        active_color.name, active_color.domain,
+        active_color.data_type, len(active_color.data)
+    )
+
+
+def get_mesh_histogram(ob: Object) -> MeshHistogram | None:
+    """Get the (cached) color histogram of an object's mesh."""
+    import numpy as np
+    from .palette import color_histogram
+
+    data = ob.data
+    key = data.as_pointer()
+    signature = get_histogram_signature(data)
+    if signature is None:
+        _mesh_histograms.pop(key, None)
+        return None
+
+    histogram = _mesh_histograms.get(key)
+    if histogram is not None and key not in _dirty_meshes \
+    and histogram.signature == signature:
+        return histogram
+
+    keys, counts, _inverse = color_histogram(read_object_colors(ob))
+    histogram = _mesh_histograms[key] = MeshHistogram(
+        signature, keys, counts.astype(np.int64)
+    )
+    _dirty_meshes.discard(key)
+    return histogram
+
+
+def merge_histograms(histograms: list) -> tuple:
+    """Merge per-object histograms into unique keys with their
+    total element counts & the number of objects using each key."""
+    import numpy as np
+
+    if not histograms:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty.astype(np.uint32), empty, empty
+    all_keys = np.concatenate([histogram.keys for histogram in histograms])
+    all_counts = np.concatenate(
+        [histogram.counts for histogram in histograms]
+    )
+    keys, inverse = np.unique(all_keys, return_inverse=True)
+    counts = np.bincount(inverse, weights=all_counts, minlength=len(keys))
+    object_counts = np.bincount(inverse, minlength=len(keys))
+    return keys, counts.astype(np.int64), object_counts
+
+
+def get_palette_objects(context) -> list[Object]:
+    color_plus = context.scene.color_plus
+    if color_plus.scene_palette_source == 'COLLECTION' \
+    and color_plus.scene_palette_collection is not None:
+        objects = color_plus.scene_palette_collection.all_objects
+    else:
+        objects = context.scene.objects
+    return [ob for ob in objects if ob.type == 'MESH']
+
+
+def rebuild_scene_palette(context) -> None:
+    """Rebuild the scene palette from every mesh object in the
+    scene (or a collection), most used colors first."""
+    import numpy as np
+    from .colorspace import key_colors
+
+    preferences = context.preferences.addons[__package__].preferences
+    convert_option = context.scene.color_plus.rgb_hsv_convert_options
+
+    histograms = []
+    for ob in get_palette_objects(context):
+        histogram = get_mesh_histogram(ob)
+        if histogram is not None:
+            histograms.append(histogram)
+    keys, counts, object_counts = merge_histograms(histograms)
+
+    order = np.argsort(-counts, kind='stable')[:preferences.max_outliner_items]
+    colors = key_colors(keys[order]).tolist()
+
+    scene_palette = context.scene.color_plus_palette
+    scene_palette.clear()
+    for color, count, object_count in zip(
+            colors, counts[order].tolist(), object_counts[order].tolist()
+        ):
+        item = scene_palette.add()
+        item.color = color
+        item.count = count
+        item.object_count = object_count
+        item.name = format_color_name(color, convert_option)
+
+
+def get_objects_using_color(context, color) -> list[Object]:
+    """Get the objects whose mesh uses a color."""
+    import numpy as np
+    from .colorspace import color_keys
+
+    key = color_keys(np.array(color))
+    objects = []
+    for ob in get_palette_objects(context):
+        histogram = get_mesh_histogram(ob)
+        if histogram is None or not len(histogram.keys):
+            continue
+        idx = np.searchsorted(histogram.keys, key)
+        if idx < len(histogram.keys) and histogram.keys[idx] == key:
+            objects.append(ob)
+    return objects
+
+
+#########################################
+# INVALIDATION
+#########################################
+
+
+_refresh_requests = set()
+_last_update = 0.0
+
+
+def request_palette_refresh(ob: Object) -> None:
+    """Schedule a rebuild of an object's palette if it is out of date.
+
+    Safe to call from `draw`, which may not write properties itself."""
+    if ob is None or ob.type != 'MESH' \
+    or ob.data.as_pointer() not in _dirty_palettes:
+        return
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    if not preferences.auto_palette_refresh:
+        return
+    # NOTE: The swatch edit rebuilds once it's finished
+    if any(edit.object_name == ob.name for edit in _swatch_edits.values()):
+        return
+
+    _refresh_requests.add(ob.name)
+    if not bpy.app.timers.is_registered(refresh_palettes):
+        bpy.app.timers.register(
+            refresh_palettes, first_interval=PALETTE_REFRESH_DELAY
+        )
+
+
+def refresh_palettes() -> float | None:
+    """Timer rebuilding the requested out of date palettes
+    once their meshes stopped changing."""
+    wait = _last_update + PALETTE_REFRESH_DELAY - time.monotonic()
+    if wait > 0:
+        return wait
+
+    for object_name in _refresh_requests:
+        ob = bpy.data.objects.get(object_name)
+        if ob is not None and ob.type == 'MESH' \
+        and ob.data.as_pointer() in _dirty_palettes:
+            rebuild_palette(ob)
+    _refresh_requests.clear()
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    return None
+
+
+@persistent
+def on_depsgraph_update(_scene, depsgraph) -> None:
+    """Mark the meshes of geometry updates as changed."""
+    global _last_update # pylint: disable=W0603
+    updated = {}
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if not update.is_updated_geometry:
+            continue # NOTE: e.g. Edit Mode selection changes
+        if isinstance(id_data, Mesh):
+            updated[id_data.as_pointer()] = id_data
+        elif isinstance(id_data, Object) and isinstance(id_data.data, Mesh):
+            updated[id_data.data.as_pointer()] = id_data.data
+
+    for key, data in updated.items():
+        # NOTE: Only skip our own update if the colors are still the
+        # ones read, otherwise a user edit made alongside it is lost
+        signature = _self_updates.pop(key, None)
+        if signature is not None \
+        and signature == get_update_signature(data):
+            continue
+        _dirty_meshes.add(key)
+        _dirty_palettes.add(key)
+        _last_update = time.monotonic()
+
+
+@persistent
+def on_load_post(*_args) -> None:
+    # NOTE: Mesh pointers are meaningless in another file
+    _mesh_histograms.clear()
+    _palette_models.clear()
+    _dirty_meshes.clear()
+    _dirty_palettes.clear()
+    _self_updates.clear()
+
+
+##################################
+# REGISTRATION
+##################################
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.load_post, on_load_post)
+)
+
+def register():
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    for timer in (apply_swatch_edits, refresh_palettes):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    _swatch_edits.clear()
+    _refresh_requests.clear()
+    on_load_post()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
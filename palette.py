@@ -0,0 +1,329 @@
+"""Vectorized color palette analysis.
+
+Colors are compared by their 8-bit RGBA keys (see `colorspace.color_keys`),
+the same precision the Palette Outliner & byte attributes work at.
+"""
+
+
+from typing import NamedTuple
+
+import numpy as np
+
+from bpy.types import Mesh
+
+from .colorspace import color_keys, key_colors, srgb_to_linear
+from .topology import MeshTopology
+
+
+KMEANS_ITERATIONS = 24
+KMEANS_CHUNK_SIZE = 65536
+# Bits per RGB channel of image histogram bins
+HISTOGRAM_BITS = 5
+
+# Linear sRGB to CIE XYZ, normalized by the D65 white point
+D65_WHITE = np.array((.95047, 1.0, 1.08883), dtype=np.float32)
+RGB_TO_XYZ = np.array((
+    (.4124564, .3575761, .1804375),
+    (.2126729, .7151522, .0721750),
+    (.0193339, .1191920, .9503041)
+), dtype=np.float32) / D65_WHITE[:, None]
+
+
+class ColorStats(NamedTuple):
+    mean: np.ndarray
+    median: np.ndarray
+    mode: np.ndarray
+    count: int
+
+
+def color_histogram(
+        colors: np.ndarray, weights: np.ndarray | None=None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the unique color keys, their (weighted) counts & the
+    index of every color into the unique keys."""
+    keys, inverse = np.unique(color_keys(colors), return_inverse=True)
+    counts = np.bincount(inverse, weights=weights, minlength=len(keys))
+    return keys, counts, inverse
+
+
+def weighted_median(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Get the weighted median of every column of `(n, c)` values."""
+    medians = np.empty(values.shape[1], dtype=np.float32)
+    for channel in range(values.shape[1]):
+        order = np.argsort(values[:, channel], kind='stable')
+        cumulative = np.cumsum(weights[order])
+        idx = np.searchsorted(cumulative, cumulative[-1] / 2)
+        medians[channel] = values[order[idx], channel]
+    return medians
+
+
+def color_stats(
+        colors: np.ndarray, weights: np.ndarray | None=None
+    ) -> ColorStats | None:
+    """Get the mean, per-channel median & most common color.
+
+    The mode is the most common 8-bit color, when weighted
+    it is the color covering the largest total weight."""
+    if not len(colors):
+        return None
+    if weights is None:
+        weights = np.ones(len(colors), dtype=np.float64)
+    if weights.sum() <= 0:
+        return None
+
+    keys, counts, _inverse = color_histogram(colors, weights)
+    return ColorStats(
+        mean=np.average(colors, axis=0, weights=weights).astype(np.float32),
+        median=weighted_median(colors, weights),
+        mode=key_colors(keys[np.argmax(counts)]),
+        count=len(colors)
+    )
+
+
+def area_weights(
+        data: Mesh, topology: MeshTopology, domain: str
+    ) -> np.ndarray:
+    """Get per corner/vertex weights from face areas.
+
+    Each face spreads its area evenly over its corners,
+    vertices sum the weights of their corners."""
+    face_areas = np.empty(len(topology.face_loop_totals), dtype=np.float32)
+    data.polygons.foreach_get("area", face_areas)
+    weights = (face_areas / np.maximum(topology.face_loop_totals, 1)) \
+        [topology.loop_face_indices]
+    if domain == 'POINT':
+        return np.bincount(
+            topology.loop_vertex_indices, weights=weights,
+            minlength=topology.vert_count
+        )
+    return weights.astype(np.float64)
+
+
+def rgb_to_hsv(colors: np.ndarray) -> np.ndarray:
+    """Convert `(n, 4)` colors to `(n, 3)` hue, saturation & value."""
+    rgb = colors[:, :3]
+    max_channel = rgb.max(axis=1)
+    delta = max_channel - rgb.min(axis=1)
+    safe_delta = np.where(delta > 0, delta, 1)
+    red, green, blue = rgb.T
+
+    hue = np.where(
+        max_channel == red, ((green - blue) / safe_delta) % 6,
+        np.where(
+            max_channel == green,
+            (blue - red) / safe_delta + 2,
+            (red - green) / safe_delta + 4
+        )
+    )
+    hue = np.where(delta > 0, hue / 6, 0)
+    saturation = np.where(
+        max_channel > 0, delta / np.where(max_channel > 0, max_channel, 1), 0
+    )
+    return np.stack((hue, saturation, max_channel), axis=1)
+
+
+def srgb_to_lab(colors: np.ndarray) -> np.ndarray:
+    """Convert `(n, 4)` sRGB colors to CIE Lab, alpha is scaled to
+    the same 0-100 range as lightness."""
+    xyz = srgb_to_linear(colors)[:, :3] @ RGB_TO_XYZ.T
+    xyz = np.where(
+        xyz > (6 / 29) ** 3,
+        np.cbrt(xyz),
+        xyz / (3 * (6 / 29) ** 2) + 4 / 29
+    )
+    lab = np.empty((len(colors), 4), dtype=np.float32)
+    lab[:, 0] = 116 * xyz[:, 1] - 16
+    lab[:, 1] = 500 * (xyz[:, 0] - xyz[:, 1])
+    lab[:, 2] = 200 * (xyz[:, 1] - xyz[:, 2])
+    lab[:, 3] = colors[:, 3] * 100
+    return lab
+
+
+def nearest_centers(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Get the index of the nearest center of every point.
+
+    Distances are computed in chunks to bound memory use."""
+    labels = np.empty(len(points), dtype=np.int64)
+    center_norms = np.einsum('ij,ij->i', centers, centers)
+    for start in range(0, len(points), KMEANS_CHUNK_SIZE):
+        chunk = points[start:start + KMEANS_CHUNK_SIZE]
+        # NOTE: |p - c|^2 without the constant |p|^2 term
+        distances = center_norms - 2 * chunk @ centers.T
+        labels[start:start + KMEANS_CHUNK_SIZE] = distances.argmin(axis=1)
+    return labels
+
+
+def kmeans(
+        points: np.ndarray, weights: np.ndarray, cluster_count: int,
+        iterations: int=KMEANS_ITERATIONS, seed: int=0
+    ) -> np.ndarray:
+    """Weighted k-means, returns the cluster label of every point.
+
+    Centers are seeded with k-means++ so results are
+    stable & well spread for a given seed."""
+    rng = np.random.default_rng(seed)
+    points = points.astype(np.float64)
+    probabilities = weights / weights.sum()
+
+    centers = np.empty((cluster_count, points.shape[1]))
+    centers[0] = points[rng.choice(len(points), p=probabilities)]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for idx in range(1, cluster_count):
+        scores = distances * weights
+        if scores.sum() <= 0:
+            centers = centers[:idx]
+            break
+        centers[idx] = points[rng.choice(len(points), p=scores / scores.sum())]
+        distances = np.minimum(
+            distances, ((points - centers[idx]) ** 2).sum(axis=1)
+        )
+
+    labels = nearest_centers(points, centers)
+    for _ in range(iterations):
+        totals = np.bincount(labels, weights=weights, minlength=len(centers))
+        used = totals > 0
+        for channel in range(points.shape[1]):
+            centers[used, channel] = np.bincount(
+                labels, weights=points[:, channel] * weights,
+                minlength=len(centers)
+            )[used] / totals[used]
+        new_labels = nearest_centers(points, centers)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return labels
+
+
+def quantize_colors(
+        colors: np.ndarray, color_count: int, color_space: str='RGB'
+    ) -> np.ndarray:
+    """Reduce colors to at most `color_count` unique colors.
+
+    Clustering runs on the unique colors weighted by how often
+    they appear rather than on every corner, each color is
+    then replaced with the (sRGB) average of its cluster."""
+    if not len(colors):
+        return colors
+    keys, counts, inverse = color_histogram(colors)
+    if len(keys) <= color_count:
+        return colors
+
+    unique_colors = key_colors(keys)
+    points = unique_colors
+    if color_space == 'LAB':
+        points = srgb_to_lab(unique_colors)
+    labels = kmeans(points, counts.astype(np.float64), color_count)
+
+    totals = np.bincount(labels, weights=counts)
+    used = totals > 0
+    centers = np.zeros((len(totals), 4), dtype=np.float32)
+    for channel in range(4):
+        centers[used, channel] = np.bincount(
+            labels, weights=unique_colors[:, channel] * counts
+        )[used] / totals[used]
+    return centers[labels][inverse]
+
+
+def binned_histogram(
+        colors: np.ndarray, bits: int=HISTOGRAM_BITS
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Histogram colors into `2 ** (bits * 3)` RGB bins, returns the
+    mean color & count of every non-empty bin.
+
+    Bins are counted with `bincount` over the packed bin index,
+    so there is no sort no matter how many colors there are."""
+    levels = (1 << bits) - 1
+    quantized = np.rint(np.clip(colors[:, :3], 0, 1) * levels) \
+        .astype(np.int64)
+    bins = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) \
+         | quantized[:, 2]
+
+    bin_count = 1 << (bits * 3)
+    counts = np.bincount(bins, minlength=bin_count)
+    used = np.flatnonzero(counts)
+    means = np.ones((len(used), 4), dtype=np.float32)
+    for channel in range(3):
+        means[:, channel] = np.bincount(
+            bins, weights=colors[:, channel], minlength=bin_count
+        )[used] / counts[used]
+    return means, counts[used]
+
+
+def extract_palette(
+        colors: np.ndarray, color_count: int,
+        method: str='CLUSTER', color_space: str='LAB'
+    ) -> np.ndarray:
+    """Get up to `color_count` opaque colors representing `colors`,
+    most common first. Fully transparent colors are ignored.
+
+    `TOP` picks the fullest histogram bins, `CLUSTER` runs
+    k-means over the bins weighted by their counts."""
+    colors = colors[colors[:, 3] > 0]
+    if not len(colors):
+        return np.empty((0, 4), dtype=np.float32)
+    bin_colors, counts = binned_histogram(colors)
+
+    if method == 'TOP' or len(bin_colors) <= color_count:
+        order = np.argsort(-counts, kind='stable')[:color_count]
+        return bin_colors[order]
+
+    points = bin_colors
+    if color_space == 'LAB':
+        points = srgb_to_lab(bin_colors)
+    weights = counts.astype(np.float64)
+    labels = kmeans(points, weights, color_count)
+
+    totals = np.bincount(labels, weights=weights)
+    used = np.flatnonzero(totals)
+    centers = np.ones((len(used), 4), dtype=np.float32)
+    for channel in range(3):
+        centers[:, channel] = np.bincount(
+            labels, weights=bin_colors[:, channel] * weights
+        )[used] / totals[used]
+    return centers[np.argsort(-totals[used], kind='stable')]
+
+
+def remap_colors(
+        colors: np.ndarray, old_colors: np.ndarray, new_colors: np.ndarray
+    ) -> tuple[np.ndarray, int]:
+    """Replace every color matching an `old_colors` entry with
+    the paired `new_colors` entry, returns the remapped buffer
+    & how many colors were replaced.
+
+    The table is sorted by key once & each color is looked
+    up with a binary search, so the whole table is applied in
+    a single pass. The first pair wins for duplicate old colors."""
+    old_colors = np.asarray(old_colors, dtype=np.float32).reshape(-1, 4)
+    new_colors = np.asarray(new_colors, dtype=np.float32).reshape(-1, 4)
+    if not len(colors) or not len(old_colors):
+        return colors, 0
+
+    table_keys, first = np.unique(color_keys(old_colors), return_index=True)
+    table_colors = new_colors[first]
+
+    keys = color_keys(colors)
+    idx = np.minimum(np.searchsorted(table_keys, keys), len(table_keys) - 1)
+    matched = table_keys[idx] == keys
+
+    colors = colors.copy()
+    colors[matched] = table_colors[idx[matched]]
+    return colors, int(np.count_nonzero(matched))
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
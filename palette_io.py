@@ -0,0 +1,440 @@
+"""Data-only palette files.
+
+Palettes are plain data, never executed, so they are safe to share
+& fast to read. Supported formats:
+
+- `.json` Vertex Colors Plus palettes (read & write)
+- `.gpl` GIMP palettes (read & write)
+- `.ase` Adobe Swatch Exchange (read)
+- `.py` legacy Blender presets of the 16 color custom palette (read)
+
+Saved palettes live in the extension's user directory. Their names
+& swatch counts are kept in an on-disk index that is only updated
+for files that changed, so listing hundreds of palettes never
+parses them. The index is written from a timer, never while
+a menu draws.
+"""
+
+
+import os
+import re
+import ast
+import json
+import struct
+from typing import NamedTuple
+
+import bpy
+
+
+PALETTE_FORMAT = "vcp-palette"
+PALETTE_VERSION = 1
+PALETTE_EXTENSIONS = (".json", ".gpl", ".ase")
+LEGACY_PRESET_SUBDIR = "color_plus"
+INDEX_FILENAME = "index.json"
+
+
+class PaletteData(NamedTuple):
+    name: str
+    colors: list
+    swatch_names: list
+
+
+class PaletteFileError(Exception):
+    pass
+
+
+def to_rgba(color) -> list:
+    """Pad RGB(A) values to RGBA, alpha defaults to opaque."""
+    color = [float(channel) for channel in color]
+    if len(color) not in (3, 4):
+        raise PaletteFileError(f"Invalid color {color}")
+    return (color + [1.0])[:4]
+
+
+def file_stem(filepath: str) -> str:
+    return os.path.splitext(os.path.basename(filepath))[0]
+
+
+#########################################
+# JSON
+#########################################
+
+
+def read_json(filepath: str) -> PaletteData:
+    with open(filepath, encoding="utf-8") as file:
+        data = json.load(file)
+    if not isinstance(data, dict) or data.get("format") != PALETTE_FORMAT:
+        raise PaletteFileError("Not a Vertex Colors Plus palette")
+    swatches = data.get("swatches", [])
+    if not isinstance(swatches, list) \
+    or not all(isinstance(swatch, dict) for swatch in swatches):
+        raise PaletteFileError("Invalid palette swatches")
+    return PaletteData(
+        data.get("name") or file_stem(filepath),
+        [to_rgba(swatch["color"]) for swatch in swatches],
+        [swatch.get("name", "") for swatch in swatches]
+    )
+
+
+def write_json(filepath: str, palette: PaletteData) -> None:
+    swatch_names = palette.swatch_names or [""] * len(palette.colors)
+    data = {
+        "format": PALETTE_FORMAT,
+        "version": PALETTE_VERSION,
+        "name": palette.name,
+        "swatches": [
+            {"name": name, "color": [round(channel, 6) for channel in color]}
+            for name, color in zip(swatch_names, palette.colors)
+        ]
+    }
+    with open(filepath, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=1)
+
+
+#########################################
+# GIMP
+#########################################
+
+
+def read_gpl(filepath: str) -> PaletteData:
+    with open(filepath, encoding="utf-8", errors="replace") as file:
+        lines = file.read().splitlines()
+    if not lines or not lines[0].startswith("GIMP Palette"):
+        raise PaletteFileError("Not a GIMP palette")
+
+    name = file_stem(filepath)
+    colors = []
+    swatch_names = []
+    for line in lines[1:]:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("Name:"):
+            name = line[5:].strip() or name
+            continue
+        if line.startswith("Columns:"):
+            continue
+        values = line.split(None, 3)
+        if len(values) < 3:
+            continue
+        colors.append(to_rgba(int(value) / 255 for value in values[:3]))
+        swatch_names.append(values[3] if len(values) > 3 else "")
+    return PaletteData(name, colors, swatch_names)
+
+
+def write_gpl(filepath: str, palette: PaletteData) -> None:
+    swatch_names = palette.swatch_names or [""] * len(palette.colors)
+    lines = ["GIMP Palette", f"Name: {palette.name}", "#"]
+    for name, color in zip(swatch_names, palette.colors):
+        red, green, blue = (round(channel * 255) for channel in color[:3])
+        lines.append(f"{red:3d} {green:3d} {blue:3d}\t{name}")
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+#########################################
+# ADOBE SWATCH EXCHANGE
+#########################################
+
+
+ASE_COLOR_ENTRY = 0x0001
+
+
+def lab_to_srgb(lightness: float, a: float, b: float) -> list:
+    """Convert CIE Lab (D65) to sRGB."""
+    def inverse(value: float) -> float:
+        if value > 6 / 29:
+            return value ** 3
+        return 3 * (6 / 29) ** 2 * (value - 4 / 29)
+
+    y = (lightness + 16) / 116
+    x = inverse(y + a / 500) * .95047
+    z = inverse(y - b / 200) * 1.08883
+    y = inverse(y)
+    linear = (
+        3.2404542 * x - 1.5371385 * y - .4985314 * z,
+        -.9692660 * x + 1.8760108 * y + .0415560 * z,
+        .0556434 * x - .2040259 * y + 1.0572252 * z
+    )
+    srgb = []
+    for channel in linear:
+        channel = min(max(channel, 0.0), 1.0)
+        if channel <= .0031308:
+            srgb.append(channel * 12.92)
+        else:
+            srgb.append(1.055 * channel ** (1 / 2.4) - .055)
+    return srgb
+
+
+def ase_to_rgb(model: bytes, values: tuple) -> list:
+    if model == b"RGB ":
+        return list(values)
+    if model == b"Gray":
+        return [values[0]] * 3
+    if model == b"CMYK":
+        cyan, magenta, yellow, black = values
+        return [(1 - channel) * (1 - black)
+                for channel in (cyan, magenta, yellow)]
+    if model == b"LAB ":
+        # NOTE: Lightness is stored as 0-1
+        return lab_to_srgb(values[0] * 100, values[1], values[2])
+    raise PaletteFileError(f"Unsupported ASE color model {model!r}")
+
+
+def read_ase(filepath: str) -> PaletteData:
+    with open(filepath, "rb") as file:
+        data = file.read()
+    if data[:4] != b"ASEF":
+        raise PaletteFileError("Not an Adobe Swatch Exchange file")
+
+    channel_counts = {b"RGB ": 3, b"LAB ": 3, b"CMYK": 4, b"Gray": 1}
+    colors = []
+    swatch_names = []
+    offset = 12
+    try:
+        (block_count,) = struct.unpack_from(">I", data, 8)
+        for _ in range(block_count):
+            block_type, length = struct.unpack_from(">HI", data, offset)
+            offset += 6
+            block = data[offset:offset + length]
+            offset += length
+            if block_type != ASE_COLOR_ENTRY:
+                continue # NOTE: Group start/end blocks
+            (name_length,) = struct.unpack_from(">H", block, 0)
+            name = block[2:2 + name_length * 2].decode("utf-16-be")
+            cursor = 2 + name_length * 2
+            model = block[cursor:cursor + 4]
+            values = struct.unpack_from(
+                f">{channel_counts.get(model, 0)}f", block, cursor + 4
+            )
+            colors.append(to_rgba(ase_to_rgb(model, values)))
+            swatch_names.append(name.rstrip("\0"))
+    except struct.error as error:
+        raise PaletteFileError("Truncated ASE file") from error
+    return PaletteData(file_stem(filepath), colors, swatch_names)
+
+
+#########################################
+# LEGACY PRESETS
+#########################################
+
+
+LEGACY_PRESET_LINE = re.compile(
+    r"^\s*color_plus\.color_custom_(\d+)\s*=\s*(.+?)\s*$", re.MULTILINE
+)
+
+
+def read_legacy_preset(filepath: str) -> PaletteData:
+    """Read a legacy `.py` preset without executing it.
+
+    Only the `color_plus.color_custom_N = (...)` literals are parsed."""
+    with open(filepath, encoding="utf-8") as file:
+        text = file.read()
+
+    custom_colors = {}
+    for match in LEGACY_PRESET_LINE.finditer(text):
+        try:
+            value = ast.literal_eval(match.group(2))
+        except (ValueError, SyntaxError) as error:
+            raise PaletteFileError(f"Invalid preset value {match.group(2)}") \
+                from error
+        custom_colors[int(match.group(1))] = to_rgba(value)
+    if not custom_colors:
+        raise PaletteFileError("No custom palette colors in preset")
+    colors = [custom_colors[idx] for idx in sorted(custom_colors)]
+    return PaletteData(
+        bpy.path.display_name(file_stem(filepath)), colors, [""] * len(colors)
+    )
+
+
+#########################################
+# FILES
+#########################################
+
+
+READERS = {
+    ".json": read_json,
+    ".gpl": read_gpl,
+    ".ase": read_ase,
+    ".py": read_legacy_preset
+}
+
+WRITERS = {
+    ".json": write_json,
+    ".gpl": write_gpl
+}
+
+
+def read_palette(filepath: str) -> PaletteData:
+    """Read a palette file, any malformed content
+    raises a `PaletteFileError`."""
+    reader = READERS.get(os.path.splitext(filepath)[1].lower())
+    if reader is None:
+        raise PaletteFileError(f"Unsupported palette file {filepath}")
+    try:
+        return reader(filepath)
+    except (KeyError, TypeError, IndexError, ValueError,
+            struct.error) as error:
+        raise PaletteFileError(f"Malformed palette file: {error}") \
+            from error
+
+
+def write_palette(filepath: str, palette: PaletteData) -> None:
+    writer = WRITERS.get(os.path.splitext(filepath)[1].lower())
+    if writer is None:
+        raise PaletteFileError(f"Unsupported palette file {filepath}")
+    writer(filepath, palette)
+
+
+def get_palette_directory() -> str:
+    """Get (creating it) the directory saved palettes live in."""
+    return bpy.utils.extension_path_user(
+        __package__, path="palettes", create=True
+    )
+
+
+def get_palette_filepath(name: str) -> str:
+    filename = bpy.path.clean_name(name) + ".json"
+    return os.path.join(get_palette_directory(), filename)
+
+
+def get_legacy_preset_directories() -> list[str]:
+    return bpy.utils.preset_paths(LEGACY_PRESET_SUBDIR)
+
+
+#########################################
+# INDEX
+#########################################
+
+
+class PaletteEntry(NamedTuple):
+    filepath: str
+    name: str
+    count: int
+
+
+_index = {}
+# Directories whose index changed since it was last saved
+_unsaved_indices = set()
+
+
+def scan_directory(directory: str, extensions: tuple) -> list[os.DirEntry]:
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return []
+    return [
+        entry for entry in entries
+        if entry.is_file() and entry.name != INDEX_FILENAME
+        and os.path.splitext(entry.name)[1].lower() in extensions
+    ]
+
+
+def load_index(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, INDEX_FILENAME),
+                  encoding="utf-8") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict):
+        return {}
+    return {
+        filename: record for filename, record in index.items()
+        if isinstance(record, dict) and isinstance(record.get("name"), str)
+        and isinstance(record.get("count"), int)
+    }
+
+
+def save_index(directory: str, index: dict) -> None:
+    try:
+        with open(os.path.join(directory, INDEX_FILENAME), "w",
+                  encoding="utf-8") as file:
+            json.dump(index, file)
+    except OSError:
+        pass
+
+
+def save_indices() -> None:
+    """Timer saving the indices that changed since they were last saved."""
+    for directory in _unsaved_indices:
+        if directory in _index:
+            save_index(directory, _index[directory])
+    _unsaved_indices.clear()
+
+
+def index_directory(
+        directory: str, extensions: tuple, persistent: bool=True
+    ) -> list[PaletteEntry]:
+    """Get the palettes of a directory, only parsing new or changed files.
+
+    Persistent indices are also saved next to the palettes (by
+    `save_indices`, as this runs while menus draw) so they
+    survive restarts."""
+    if directory not in _index:
+        _index[directory] = load_index(directory) if persistent else {}
+    index = _index[directory]
+
+    updated_index = {}
+    for entry in scan_directory(directory, extensions):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        record = index.get(entry.name)
+        if record is None or record.get("mtime") != stat.st_mtime_ns \
+        or record.get("size") != stat.st_size:
+            try:
+                palette = read_palette(entry.path)
+            except (OSError, PaletteFileError):
+                continue
+            record = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "name": palette.name,
+                "count": len(palette.colors)
+            }
+        updated_index[entry.name] = record
+
+    if updated_index != index:
+        _index[directory] = updated_index
+        if persistent:
+            _unsaved_indices.add(directory)
+            if not bpy.app.timers.is_registered(save_indices):
+                bpy.app.timers.register(save_indices, first_interval=0)
+
+    return [
+        PaletteEntry(
+            os.path.join(directory, filename), record["name"], record["count"]
+        )
+        for filename, record in updated_index.items()
+    ]
+
+
+def get_palette_entries() -> list[PaletteEntry]:
+    """Get every saved palette & legacy preset, sorted by name."""
+    entries = index_directory(get_palette_directory(), PALETTE_EXTENSIONS)
+    for directory in get_legacy_preset_directories():
+        # NOTE: Legacy preset folders are shared with
+        # Blender, so their index is kept in memory only
+        entries.extend(index_directory(directory, (".py",), persistent=False))
+    return sorted(entries, key=lambda entry: entry.name.lower())
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -2,10 +2,9 @@ import colorsys
 
 import bpy
 import rna_keymap_ui
-from bl_ui.utils import PresetPanel
-from bl_operators.presets import AddPresetBase
+from bpy.app.handlers import persistent
 
-from bpy.types import Panel, AddonPreferences, Context, Menu
+from bpy.types import AddonPreferences, Context
 from bpy.props import (
     BoolProperty,
     FloatProperty,
@@ -17,7 +16,11 @@ from bpy.props import (
     CollectionProperty
 )
 
-from .constants import MAX_OUTLINER_ITEM_MSG
+from .constants import (
+    MAX_OUTLINER_ITEM_MSG,
+    BLEND_MODE_ITEMS,
+    DEFAULT_CUSTOM_PALETTE
+)
 
 
 ##################################
@@ -244,8 +247,12 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
                 variation_value='alpha_var'
             )
 
-    def palette_update(self, _context: Context):
-        bpy.ops.color_plus.refresh_palette_outliner()
+    def palette_update(self, context: Context):
+        # NOTE: Display only, re-renders the cached palettes
+        from .outliner import render_palette
+        for ob in {*context.selected_objects, context.object}:
+            if ob is not None and ob.type == 'MESH':
+                render_palette(ob)
 
     live_color_tweak: BoolProperty(
         name="Live Edit",
@@ -260,6 +267,19 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         )
     )
 
+    blend_mode: EnumProperty(
+        items=BLEND_MODE_ITEMS,
+        name="Blend Mode",
+        description="How the applied color is mixed with the existing color"
+    )
+
+    blend_opacity: FloatProperty(
+        name="Opacity",
+        description="Strength of the applied color",
+        default=1, min=0, max=1,
+        subtype='FACTOR'
+    )
+
     custom_apply_option: EnumProperty(
         items=(
             ('apply_to_sel', "RGBA", ""),
@@ -277,6 +297,24 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         update=palette_update
     )
 
+    palette_sort: EnumProperty(
+        name="Sort",
+        items=(
+            ('FIRST_USE', "Mesh Order", "Order colors by their first use on the mesh"),
+            ('COUNT', "Most Used", "Order colors by how many corners/vertices use them"),
+            ('HUE', "Hue", "Order grays by value, then colors by hue"),
+            ('VALUE', "Value", "Order colors from dark to bright")
+        ),
+        update=palette_update
+    )
+
+    palette_min_count: IntProperty(
+        name="Min Uses",
+        description="Hide colors used by fewer corners/vertices than this",
+        default=1, min=1,
+        update=palette_update
+    )
+
     generate: EnumProperty(
         items=(
             ('per_uv_shell', "Per UV Shell  (Random Color)", ""),
@@ -284,6 +322,7 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
             ('per_face', "Per Face", ""),
             ('per_vertex', "Per Vertex", ""),
             ('per_point', "Per Point (Face Corner)", ""),
+            ('gradient', "Gradient", ""),
             ('dirty_color', "Dirty Vertex Colors", "")
         ),
         name='Generation Type'
@@ -371,134 +410,90 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         description="Alteration visibility color value to assign"
     )
 
-    color_custom_1: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[1, 0, 0, 1], size=4,
-        min=0, max=1
-    )
-
-    color_custom_2: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[0, 1, 0, 1], size=4,
-        min=0, max=1
+    scene_palette_source: EnumProperty(
+        name="Source",
+        items=(
+            ('SCENE', "Scene", "Use every mesh object in the scene"),
+            ('COLLECTION', "Collection", "Use every mesh object in a collection")
+        )
     )
 
-    color_custom_3: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[0, 0, 1, 1], size=4,
-        min=0, max=1
+    scene_palette_collection: PointerProperty(
+        name="Collection",
+        type=bpy.types.Collection
     )
 
-    color_custom_4: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.75, .75, .75, 1], size=4,
-        min=0, max=1
+    stats_area_weighted: BoolProperty(
+        name="Weight by Face Area",
+        description="Weight every corner/vertex by the area of its faces, so large faces count more",
+        default=False
     )
 
-    color_custom_5: FloatVectorProperty(
+    stats_mean: FloatVectorProperty(
         name="",
         subtype='COLOR_GAMMA',
-        default=[.75, .75, 0, 1], size=4,
+        default=[0, 0, 0, 1], size=4,
         min=0, max=1
     )
 
-    color_custom_6: FloatVectorProperty(
+    stats_median: FloatVectorProperty(
         name="",
         subtype='COLOR_GAMMA',
-        default=[0, .75, .75, 1], size=4,
+        default=[0, 0, 0, 1], size=4,
         min=0, max=1
     )
 
-    color_custom_7: FloatVectorProperty(
+    stats_mode: FloatVectorProperty(
         name="",
         subtype='COLOR_GAMMA',
-        default=[.75, 0, .75, 1], size=4,
+        default=[0, 0, 0, 1], size=4,
         min=0, max=1
     )
 
-    color_custom_8: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.5, .5, .5, 1], size=4,
-        min=0, max=1
-    )
+    stats_count: IntProperty()
 
-    color_custom_9: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.5, .75, 0, 1], size=4,
-        min=0, max=1
+    sample_image: PointerProperty(
+        name="Image",
+        description="Image to sample into the active color attribute through the active UV map",
+        type=bpy.types.Image
     )
 
-    color_custom_10: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[0, .5, .75, 1], size=4,
-        min=0, max=1
+    sample_supersampling: IntProperty(
+        name="Supersampling",
+        description="Average a grid of this many samples squared over each corner's share of its face in UV space. 1 only samples the corner's UV",
+        default=1,
+        min=1,
+        max=8
     )
 
-    color_custom_11: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.75, 0, .5, 1], size=4,
-        min=0, max=1
+    sample_selection_only: BoolProperty(
+        name="Selection Only",
+        description="Only sample into the selected elements of meshes in Edit Mode",
+        default=False
     )
 
-    color_custom_12: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.25, .25, .25, 1], size=4,
-        min=0, max=1
+    custom_palette_name: StringProperty(
+        name="Palette Name",
+        description="Name of the palette last loaded into or saved from the Customizable Palette",
+        default="Custom Palette"
     )
 
-    color_custom_13: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.25, .5, 0, 1], size=4,
-        min=0, max=1
-    )
-
-    color_custom_14: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[0, .5, .25, 1], size=4,
-        min=0, max=1
-    )
-
-    color_custom_15: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[.25, 0, .5, 1], size=4,
-        min=0, max=1
-    )
-
-    color_custom_16: FloatVectorProperty(
-        name="",
-        subtype='COLOR_GAMMA',
-        default=[0, 0, 0, 1], size=4,
-        min=0, max=1
-    )
+    # NOTE: Set once the scene got its default palette, an
+    # emptied palette is a valid state & kept from then on
+    custom_palette_initialized: BoolProperty(options={'HIDDEN'})
 
 
 class COLORPLUS_collection_property(bpy.types.PropertyGroup):
     def update_palette_color(self, _context: Context):
         if [*self.color] == [*self.saved_color]:
             return
-        bpy.ops.color_plus.change_outliner_color(saved_active_idx=self.id)
-
-        # This only somewhat fixes the
-        # clearing [1,1,1,1] val colors
-        if [*self.color[:3]] != [1, 1, 1] \
-        and [*self.saved_color[:3]] != [1, 1, 1]:
-            bpy.ops.color_plus.refresh_palette_outliner(
-                saved_active_idx=self.id
-            )
+        # NOTE: Picker ticks are coalesced, the palette
+        # is rebuilt once the interaction ends
+        from .outliner import queue_swatch_edit
+        queue_swatch_edit(self.id_data, self.id)
 
     id: IntProperty()
+    count: IntProperty(name="Corners/Vertices")
     color: FloatVectorProperty(
         name="",
         subtype='COLOR_GAMMA',
@@ -520,55 +515,73 @@ class COLORPLUS_collection_property(bpy.types.PropertyGroup):
     )
 
 
+class COLORPLUS_scene_palette_item(bpy.types.PropertyGroup):
+    color: FloatVectorProperty(
+        name="",
+        subtype='COLOR_GAMMA',
+        default=[0, 0, 0, 1],
+        size=4,
+        min=0,
+        max=1
+    )
+    count: IntProperty(name="Corners/Vertices")
+    object_count: IntProperty(name="Objects")
+
+
+class COLORPLUS_swatch(bpy.types.PropertyGroup):
+    color: FloatVectorProperty(
+        name="",
+        subtype='COLOR_GAMMA',
+        default=[1, 1, 1, 1], size=4,
+        min=0, max=1
+    )
+
+
 #########################################
-# PRESETS
+# CUSTOM PALETTE
 #########################################
 
 
-class COLORPLUS_MT_presets(Menu):
-    bl_label = ""
-    preset_subdir = "color_plus"
-    preset_operator = "script.execute_preset"
-    draw = Menu.draw_preset
-
-
-class COLORPLUS_PT_presets(PresetPanel, Panel):
-    bl_label = "Color Presets"
-    preset_subdir = 'color_plus'
-    preset_operator = 'script.execute_preset'
-    preset_add_operator = 'color_plus.preset_add'
-
-
-class COLORPLUS_OT_add_preset(AddPresetBase, bpy.types.Operator):
-    bl_idname = "color_plus.preset_add"
-    bl_label = "Add a new preset"
-    preset_menu = "COLORPLUS_MT_presets"
-
-    # Variable used for all preset values
-    preset_defines = ["color_plus=bpy.context.scene.color_plus"]
-
-    # Properties to store in the preset
-    preset_values = [
-        "color_plus.color_custom_1",
-        "color_plus.color_custom_2",
-        "color_plus.color_custom_3",
-        "color_plus.color_custom_4",
-        "color_plus.color_custom_5",
-        "color_plus.color_custom_6",
-        "color_plus.color_custom_7",
-        "color_plus.color_custom_8",
-        "color_plus.color_custom_9",
-        "color_plus.color_custom_10",
-        "color_plus.color_custom_11",
-        "color_plus.color_custom_12",
-        "color_plus.color_custom_13",
-        "color_plus.color_custom_14",
-        "color_plus.color_custom_15",
-        "color_plus.color_custom_16"
-    ]
-
-    # Where to store the preset
-    preset_subdir = "color_plus"
+def fill_custom_palette(scene, colors, names=()) -> None:
+    """Replace the swatches of the Customizable Palette."""
+    swatches = scene.color_plus_swatches
+    swatches.clear()
+    for idx, color in enumerate(colors):
+        swatch = swatches.add()
+        swatch.color = color
+        swatch.name = names[idx] if idx < len(names) else ""
+    scene.color_plus_swatches_active = 0
+
+
+def init_custom_palette(scene) -> None:
+    """Give scenes the default palette, once.
+
+    Values of the old fixed `color_custom_N` properties saved in the
+    scene take precedence & are then removed from the file."""
+    color_plus = scene.color_plus
+    if color_plus.custom_palette_initialized:
+        return
+    color_plus.custom_palette_initialized = True
+    if len(scene.color_plus_swatches):
+        return
+    colors = [list(color) for color in DEFAULT_CUSTOM_PALETTE]
+    for idx in range(len(colors)):
+        legacy_name = f"color_custom_{idx + 1}"
+        legacy_color = color_plus.get(legacy_name)
+        if legacy_color is not None:
+            colors[idx] = list(legacy_color)
+            del color_plus[legacy_name]
+    fill_custom_palette(scene, colors)
+
+
+def init_scene_palettes() -> None:
+    for scene in bpy.data.scenes:
+        init_custom_palette(scene)
+
+
+@persistent
+def on_load_post(*_args) -> None:
+    init_scene_palettes()
 
 
 ############################################################
@@ -589,9 +602,9 @@ class COLORPLUS_MT_addon_prefs(AddonPreferences):
     auto_palette_refresh: BoolProperty(
         name="Auto Palette Refresh",
         description=
-        '''If disabled, will stop updating the entire palette outliner whenever you run an operator.
+        '''If disabled, will stop rebuilding the palette outliner whenever the mesh changes (from any tool, once edits settle).
 
-Useful if your scene is slowing down.
+Useful if your scene is slowing down, use Refresh Palette instead.
 
 Certain items may still be changed if the code interacts with the outliner directly''',
         default=True
@@ -639,28 +652,24 @@ Certain items may still be changed if the code interacts with the outliner direc
 
 
 classes = (
-    COLORPLUS_MT_presets,
-    COLORPLUS_PT_presets,
-    COLORPLUS_OT_add_preset,
     COLORPLUS_MT_addon_prefs,
     COLORPLUS_property_group,
     COLORPLUS_collection_property,
-    COLORPLUS_OT_add_hotkey
+    COLORPLUS_scene_palette_item,
+    COLORPLUS_swatch
 )
 
-def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+# Classes only needed with an interface, skipped in background sessions
+ui_classes = (
+    COLORPLUS_OT_add_hotkey,
+)
 
-    bpy.types.Scene.color_plus = PointerProperty(type=COLORPLUS_property_group)
-    bpy.types.Object.color_palette = \
-        CollectionProperty(type=COLORPLUS_collection_property)
-    bpy.types.Object.color_palette_active = \
-        IntProperty(
-            name='R G B A values for the layer (Renaming does not work)'
-        )
+def get_classes() -> tuple:
+    if bpy.app.background:
+        return classes
+    return classes + ui_classes
 
-    # Assign keymaps & register
+def register_keymaps():
     COLORPLUS_addon_keymaps.new_keymap('Vertex Colors Pie',
                                        'wm.call_menu_pie',
                                        'COLORPLUS_MT_pie_menu',
@@ -681,8 +690,37 @@ def register():
 
     COLORPLUS_addon_keymaps.register_keymaps()
 
+def register():
+    for cls in get_classes():
+        bpy.utils.register_class(cls)
+
+    bpy.types.Scene.color_plus = PointerProperty(type=COLORPLUS_property_group)
+    bpy.types.Object.color_palette = \
+        CollectionProperty(type=COLORPLUS_collection_property)
+    bpy.types.Object.color_palette_active = \
+        IntProperty(
+            name='R G B A values for the layer (Renaming does not work)'
+        )
+    bpy.types.Scene.color_plus_palette = \
+        CollectionProperty(type=COLORPLUS_scene_palette_item)
+    bpy.types.Scene.color_plus_palette_active = IntProperty()
+    bpy.types.Scene.color_plus_swatches = \
+        CollectionProperty(type=COLORPLUS_swatch)
+    bpy.types.Scene.color_plus_swatches_active = IntProperty()
+
+    bpy.app.handlers.load_post.append(on_load_post)
+    # NOTE: Data can't be edited while registering
+    bpy.app.timers.register(init_scene_palettes, first_interval=0)
+
+    # NOTE: Headless sessions have no use for key combos
+    if not bpy.app.background:
+        register_keymaps()
+
 def unregister():
-    for cls in classes:
+    if bpy.app.timers.is_registered(init_scene_palettes):
+        bpy.app.timers.unregister(init_scene_palettes)
+
+    for cls in reversed(get_classes()):
         bpy.utils.unregister_class(cls)
 
     COLORPLUS_addon_keymaps.unregister_keymaps()
@@ -690,6 +728,13 @@ def unregister():
     del bpy.types.Scene.color_plus
     del bpy.types.Object.color_palette
     del bpy.types.Object.color_palette_active
+    del bpy.types.Scene.color_plus_palette
+    del bpy.types.Scene.color_plus_palette_active
+    del bpy.types.Scene.color_plus_swatches
+    del bpy.types.Scene.color_plus_swatches_active
+
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
 
 
 # ##### BEGIN GPL LICENSE BLOCK #####
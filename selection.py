@@ -0,0 +1,112 @@
+"""Bulk snapshots of mesh selection state.
+
+Selection is read once per operator as boolean arrays (vertex,
+edge & face masks, corner masks derived through the topology)
+instead of asking BMesh about every element. Like the attribute
+helpers this must run outside of Edit Mode.
+"""
+
+
+from functools import cached_property
+
+import numpy as np
+
+from bpy.types import Mesh
+
+from .topology import MeshTopology, get_topology
+
+
+def read_mask(collection, prop: str, count: int) -> np.ndarray:
+    mask = np.empty(count, dtype=bool)
+    collection.foreach_get(prop, mask)
+    return mask
+
+
+class SelectionSnapshot:
+    """Vertex, edge & face selection masks of a mesh."""
+
+    def __init__(
+            self, topology: MeshTopology, verts: np.ndarray,
+            edges: np.ndarray, faces: np.ndarray
+        ):
+        self.topology = topology
+        self.verts = verts
+        self.edges = edges
+        self.faces = faces
+
+    @cached_property
+    def corners(self) -> np.ndarray:
+        """Face corners of selected vertices."""
+        return self.verts[self.topology.loop_vertex_indices]
+
+    @cached_property
+    def face_corners(self) -> np.ndarray:
+        """Face corners of selected faces."""
+        # NOTE: Corners are contiguous per face, so
+        # repeating by `loop_total` lines up with them
+        return np.repeat(self.faces, self.topology.face_loop_totals)
+
+    @cached_property
+    def edge_selected_faces(self) -> np.ndarray:
+        """The number of selected faces using each edge."""
+        return np.bincount(
+            self.topology.loop_edge_indices,
+            weights=self.face_corners,
+            minlength=len(self.edges)
+        ).astype(np.int32)
+
+    def domain_mask(self, domain: str) -> np.ndarray:
+        """Get the selection mask matching a color attribute domain."""
+        if domain == 'POINT':
+            return self.verts
+        return self.corners
+
+
+def get_selection(
+        data: Mesh, topology: MeshTopology | None=None
+    ) -> SelectionSnapshot:
+    """Take a snapshot of the current selection of a mesh."""
+    if topology is None:
+        topology = get_topology(data)
+    return SelectionSnapshot(
+        topology,
+        read_mask(data.vertices, "select", len(data.vertices)),
+        read_mask(data.edges, "select", len(data.edges)),
+        read_mask(data.polygons, "select", len(data.polygons))
+    )
+
+
+def select_vertices(
+        data: Mesh, verts: np.ndarray, topology: MeshTopology | None=None
+    ) -> None:
+    """Set the vertex selection & flush it to edges & faces."""
+    if topology is None:
+        topology = get_topology(data)
+    edges = verts[topology.edge_vertices].all(axis=1)
+    faces = np.zeros(len(topology.face_loop_totals), dtype=bool)
+    if len(faces):
+        faces = np.logical_and.reduceat(
+            verts[topology.loop_vertex_indices], topology.face_loop_starts
+        )
+    data.vertices.foreach_set("select", verts)
+    data.edges.foreach_set("select", edges)
+    data.polygons.foreach_set("select", faces)
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -0,0 +1,33 @@
+"""Register & unregister the add-on in an interactive session.
+
+Run from a shell, without `--background` so that the UI-only
+classes & keymaps are registered too:
+
+    blender --factory-startup --python-exit-code 1 \
+        --python tests/register_smoke.py
+"""
+
+
+import os
+import sys
+import importlib
+
+import bpy
+
+
+ADDON_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    if bpy.app.background:
+        raise SystemExit("Run without `--background`")
+    sys.path.insert(0, os.path.dirname(ADDON_DIRECTORY))
+    addon = importlib.import_module(os.path.basename(ADDON_DIRECTORY))
+    addon.register()
+    addon.unregister()
+    print("Vertex Colors Plus registered & unregistered")
+
+
+if __name__ == "__main__":
+    main()
+    bpy.ops.wm.quit_blender()
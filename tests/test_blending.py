@@ -0,0 +1,56 @@
+"""Tests for the (Blender independent) color blend modes."""
+
+
+import os
+import importlib.util
+
+import numpy as np
+import pytest
+
+
+def load_module(name: str):
+    """Load an add-on module that doesn't need Blender on its own,
+    without importing the package (and so `bpy`)."""
+    filepath = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        f"{name}.py"
+    )
+    spec = importlib.util.spec_from_file_location(name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+blending = load_module("blending")
+
+BASE = np.array([[.5, .5, .5, 1], [.5, .5, .5, .25]], dtype=np.float32)
+COLOR = (.2, .2, .2, 1)
+
+
+@pytest.mark.parametrize("blend_mode", ('ADD', 'SUBTRACT'))
+def test_blend_mode_keeps_alpha(blend_mode):
+    blended = blending.blend_colors(BASE, COLOR, blend_mode)
+    np.testing.assert_allclose(blended[:, 3], BASE[:, 3])
+
+
+def test_blend_mode_colors():
+    np.testing.assert_allclose(
+        blending.blend_colors(BASE, COLOR, 'ADD')[:, :3], .7, rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        blending.blend_colors(BASE, COLOR, 'SUBTRACT')[:, :3], .3, rtol=1e-6
+    )
+
+
+def test_replace_sets_alpha():
+    blended = blending.blend_colors(BASE, COLOR, 'REPLACE')
+    np.testing.assert_allclose(blended, np.broadcast_to(COLOR, BASE.shape))
+
+
+def test_blend_alpha():
+    blended = blending.blend_colors(
+        BASE, COLOR, 'SUBTRACT', channels=(False, False, False, True),
+        blend_alpha=True
+    )
+    np.testing.assert_allclose(blended[:, :3], BASE[:, :3])
+    np.testing.assert_allclose(blended[:, 3], 0)
@@ -0,0 +1,55 @@
+"""Registration smoke tests.
+
+The interactive test launches Blender (without `--background`, so it
+needs a display) when the `BLENDER` environment variable points to
+its executable, otherwise it is skipped.
+"""
+
+
+import os
+import ast
+import subprocess
+
+import pytest
+
+
+ADDON_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGISTRATION_NAMES = ("classes", "ui_classes")
+
+
+def get_module_paths() -> list[str]:
+    return sorted(
+        os.path.join(ADDON_DIRECTORY, filename)
+        for filename in os.listdir(ADDON_DIRECTORY)
+        if filename.endswith(".py")
+    )
+
+
+@pytest.mark.parametrize("filepath", get_module_paths(),
+                         ids=os.path.basename)
+def test_registration_sequences_are_tuples(filepath):
+    with open(filepath, encoding="utf-8") as file:
+        tree = ast.parse(file.read())
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) \
+            and target.id in REGISTRATION_NAMES:
+                assert isinstance(node.value, ast.Tuple), \
+                    f"`{target.id}` is not a tuple"
+
+
+@pytest.mark.skipif("BLENDER" not in os.environ,
+                    reason="BLENDER is not set")
+def test_interactive_register():
+    result = subprocess.run(
+        [
+            os.environ["BLENDER"], "--factory-startup",
+            "--python-exit-code", "1",
+            "--python", os.path.join(ADDON_DIRECTORY, "tests",
+                                     "register_smoke.py")
+        ],
+        capture_output=True, text=True, timeout=300, check=False
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,236 @@
+"""Cached mesh topology arrays.
+
+The base index arrays are read from the mesh on every call, as
+they are needed to validate a cache entry (element counts plus a
+checksum of the index arrays). What is cached & shared between
+operators is everything derived from them (face starts, corner
+faces, edge-face & vertex adjacency).
+"""
+
+
+import zlib
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+
+from bpy.types import Mesh
+
+from .attributes import corner_to_point
+
+
+MAX_CACHED_TOPOLOGIES = 64
+
+
+class VertexAdjacency:
+    """Vertex to vertex adjacency (via edges) in CSR form.
+
+    `indices[indptr[v]:indptr[v + 1]]` are the neighbors of vertex `v`,
+    `rows` holds the owning vertex of every entry in `indices`."""
+    __slots__ = ("indptr", "indices", "rows", "degree", "vert_count")
+
+    def __init__(self, edge_vertices: np.ndarray, vert_count: int):
+        sources = np.concatenate((edge_vertices[:, 0], edge_vertices[:, 1]))
+        targets = np.concatenate((edge_vertices[:, 1], edge_vertices[:, 0]))
+        order = np.argsort(sources, kind='stable')
+
+        self.vert_count = vert_count
+        self.rows = sources[order]
+        self.indices = targets[order]
+        self.degree = np.bincount(sources, minlength=vert_count)
+        self.indptr = np.zeros(vert_count + 1, dtype=np.int64)
+        np.cumsum(self.degree, out=self.indptr[1:])
+
+    def neighbor_sum(self, values: np.ndarray) -> np.ndarray:
+        """Sum per-vertex values (`(n,)` or `(n, c)`) over each neighborhood."""
+        gathered = values[self.indices]
+        if gathered.ndim == 1:
+            return np.bincount(
+                self.rows, weights=gathered, minlength=self.vert_count
+            )
+        return np.stack(
+            [np.bincount(self.rows, weights=gathered[:, channel],
+                         minlength=self.vert_count)
+             for channel in range(gathered.shape[1])],
+            axis=1
+        )
+
+
+def smooth_vertex_values(
+        values: np.ndarray, adjacency: VertexAdjacency,
+        iterations: int=1, factor: float=.5, mask: np.ndarray | None=None
+    ) -> np.ndarray:
+    """Smooth per-vertex values by averaging them with their neighbors.
+
+    Only masked vertices change, unmasked neighbors are still read."""
+    values = np.array(values, dtype=np.float32)
+    degree = adjacency.degree
+    update = degree > 0
+    if mask is not None:
+        update &= mask
+    degree = degree[update, None] if values.ndim == 2 else degree[update]
+
+    for _ in range(iterations):
+        averages = adjacency.neighbor_sum(values)[update] / degree
+        values[update] += (averages - values[update]) * factor
+    return values
+
+
+def smooth_corner_values(
+        values: np.ndarray, loop_vertex_indices: np.ndarray,
+        adjacency: VertexAdjacency, iterations: int=1, factor: float=.5,
+        mask: np.ndarray | None=None
+    ) -> np.ndarray:
+    """Smooth per-corner values towards the average of neighboring vertices.
+
+    Each vertex is represented by the mean of its corners, so
+    hard (split) corners soften without being merged outright."""
+    values = np.array(values, dtype=np.float32)
+
+    # NOTE: Loose & wire-only vertices have no corners & so no color
+    # of their own, leave them out of their neighbors' averages
+    has_corners = np.bincount(
+        loop_vertex_indices, minlength=adjacency.vert_count
+    ) > 0
+    neighbor_counts = adjacency.neighbor_sum(has_corners.astype(np.float32))
+
+    update = neighbor_counts[loop_vertex_indices] > 0
+    if mask is not None:
+        update &= mask
+    vert_indices = loop_vertex_indices[update]
+    counts = neighbor_counts[vert_indices, None]
+
+    for _ in range(iterations):
+        points = corner_to_point(
+            values, loop_vertex_indices, adjacency.vert_count
+        )
+        points[~has_corners] = 0
+        averages = adjacency.neighbor_sum(points)[vert_indices] / counts
+        values[update] += (averages - values[update]) * factor
+    return values
+
+
+class MeshTopology:
+    """Index arrays describing the topology of a mesh.
+
+    Only plain arrays are kept (never the `Mesh` itself),
+    anything derived from them is built on first use."""
+
+    def __init__(
+            self, signature: tuple, loop_vertex_indices: np.ndarray,
+            loop_edge_indices: np.ndarray, edge_vertices: np.ndarray,
+            face_loop_totals: np.ndarray, vert_count: int
+        ):
+        self.signature = signature
+        self.loop_vertex_indices = loop_vertex_indices
+        self.loop_edge_indices = loop_edge_indices
+        self.edge_vertices = edge_vertices
+        self.face_loop_totals = face_loop_totals
+        self.vert_count = vert_count
+
+    @cached_property
+    def face_loop_starts(self) -> np.ndarray:
+        # NOTE: Face corners are stored contiguously & in face order
+        face_loop_starts = np.zeros(len(self.face_loop_totals), dtype=np.int64)
+        np.cumsum(self.face_loop_totals[:-1], out=face_loop_starts[1:])
+        return face_loop_starts
+
+    @cached_property
+    def loop_face_indices(self) -> np.ndarray:
+        return np.repeat(
+            np.arange(len(self.face_loop_totals), dtype=np.int32),
+            self.face_loop_totals
+        )
+
+    @cached_property
+    def edge_face_counts(self) -> np.ndarray:
+        return np.bincount(
+            self.loop_edge_indices, minlength=len(self.edge_vertices)
+        )
+
+    @cached_property
+    def edge_faces(self) -> tuple[np.ndarray, np.ndarray]:
+        """Edge to face adjacency in CSR form, `(indptr, indices)`."""
+        order = np.argsort(self.loop_edge_indices, kind='stable')
+        indptr = np.zeros(len(self.edge_vertices) + 1, dtype=np.int64)
+        np.cumsum(self.edge_face_counts, out=indptr[1:])
+        return indptr, self.loop_face_indices[order]
+
+    @cached_property
+    def vertex_adjacency(self) -> VertexAdjacency:
+        return VertexAdjacency(self.edge_vertices, self.vert_count)
+
+
+def read_indices(collection, prop: str, count: int) -> np.ndarray:
+    indices = np.empty(count, dtype=np.int32)
+    collection.foreach_get(prop, indices)
+    return indices
+
+
+def checksum(*arrays: np.ndarray) -> int:
+    value = 1
+    for array in arrays:
+        value = zlib.adler32(np.ascontiguousarray(array), value)
+    return value
+
+
+_topology_cache = OrderedDict()
+
+
+def get_topology(data: Mesh) -> MeshTopology:
+    """Get the topology of a mesh from object mode.
+
+    Only the derived arrays are cached, the base index arrays
+    are read & checksummed on every call to validate the entry.
+    The least recently used entries are evicted once
+    more than `MAX_CACHED_TOPOLOGIES` meshes are cached."""
+    counts = (
+        len(data.vertices), len(data.edges),
+        len(data.polygons), len(data.loops)
+    )
+    vert_count, edge_count, face_count, loop_count = counts
+    loop_vertex_indices = \
+        read_indices(data.loops, "vertex_index", loop_count)
+    loop_edge_indices = read_indices(data.loops, "edge_index", loop_count)
+    edge_vertices = read_indices(data.edges, "vertices", edge_count * 2)
+    face_loop_totals = \
+        read_indices(data.polygons, "loop_total", face_count)
+    signature = counts + (
+        checksum(loop_vertex_indices, edge_vertices, face_loop_totals),
+    )
+
+    key = data.as_pointer()
+    topology = _topology_cache.get(key)
+    if topology is None or topology.signature != signature:
+        topology = MeshTopology(
+            signature, loop_vertex_indices, loop_edge_indices,
+            edge_vertices.reshape(-1, 2), face_loop_totals, vert_count
+        )
+        _topology_cache[key] = topology
+    _topology_cache.move_to_end(key)
+    while len(_topology_cache) > MAX_CACHED_TOPOLOGIES:
+        _topology_cache.popitem(last=False)
+    return topology
+
+
+def clear_topology_cache() -> None:
+    _topology_cache.clear()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
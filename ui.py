@@ -5,8 +5,11 @@
 import bpy
 from bpy.types import Panel, UIList, Menu
 
-from .preferences import COLORPLUS_PT_presets
 from .functions import get_active_color
+from .outliner import request_palette_refresh
+from .palette_io import (
+    get_palette_entries, get_palette_directory, save_indices
+)
 from .constants import MAX_OUTLINER_ITEM_MSG
 
 
@@ -94,6 +97,16 @@ class COLORPLUS_PT_ui(PanelInfo, Panel):
             box.scale_y = .8
             box.label(text='Face selections only!', icon='INFO')
 
+        self.draw_blend_mode(col, color_plus)
+
+    @staticmethod
+    def draw_blend_mode(layout, color_plus):
+        split = layout.split(factor=.4)
+        split.label(text='Blend')
+        row = split.row(align=True)
+        row.prop(color_plus, 'blend_mode', text='')
+        row.prop(color_plus, 'blend_opacity', text='')
+
     def draw_color_sets(self, context):
         layout = self.layout
 
@@ -140,6 +153,10 @@ class COLORPLUS_PT_ui(PanelInfo, Panel):
             col.separator()
             col.menu("MESH_MT_color_attribute_context_menu",
                      icon='DOWNARROW_HLT', text="")
+            col.operator("color_plus.convert_color_attribute",
+                         icon='ARROW_LEFTRIGHT', text="")
+            col.operator("color_plus.sync_color_attributes",
+                         icon='LINKED', text="")
 
             # TODO:
             # self.draw_attribute_warnings(context, layout)
@@ -165,6 +182,8 @@ class COLORPLUS_PT_apply(PanelInfo, Panel):
 
         col.operator("color_plus.set_color_from_active",
                      icon='RESTRICT_COLOR_ON')
+        col.operator("color_plus.smooth_color", icon='MOD_SMOOTH')
+        col.operator("color_plus.quantize_colors", icon='IMAGE_ZDEPTH')
 
         col = layout.column(align=True)
         col.scale_y = 1.1
@@ -241,6 +260,37 @@ class COLORPLUS_PT_apply(PanelInfo, Panel):
         split.prop(color_plus, 'alpha_var')
 
 
+class COLORPLUS_PT_statistics(PanelInfo, Panel):
+    bl_label = 'Selection Statistics'
+    bl_parent_id = 'COLORPLUS_PT_apply'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        color_plus = context.scene.color_plus
+        layout = self.layout
+
+        col = layout.column(align=True)
+        col.operator("color_plus.color_statistics", icon='SORTSIZE')
+        col.prop(color_plus, 'stats_area_weighted')
+
+        if not color_plus.stats_count:
+            return
+
+        col = layout.column(align=True)
+        for statistic, label in (('stats_mean', "Average"),
+                                 ('stats_median', "Median"),
+                                 ('stats_mode', "Most Common")):
+            split = col.split(factor=.4, align=True)
+            split.label(text=label)
+            row = split.row(align=True)
+            row.prop(color_plus, statistic)
+            row.operator(
+                "color_plus.use_color_statistic",
+                text='', icon='RESTRICT_COLOR_ON'
+            ).statistic = statistic
+        col.label(text=f"{color_plus.stats_count} corners/vertices sampled")
+
+
 class COLORPLUS_UL_items(UIList):
     def draw_item(self, _context, layout, _data, item, _icon,
                   _active_data, _active_propname, _index=0, _flt_flag=0):
@@ -250,7 +300,9 @@ class COLORPLUS_UL_items(UIList):
 
         split = layout.split(factor=.025)
         split.label(text="")
+        split = split.split(factor=.75)
         split.label(text=item.name)
+        split.label(text=str(item.count))
 
 
 class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
@@ -266,6 +318,7 @@ class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
 
         ob = context.object
         preferences = context.preferences.addons[__package__].preferences
+        request_palette_refresh(ob)
 
         disable_ui = False
         if not ob.color_palette:
@@ -309,6 +362,11 @@ class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
         row2.prop(context.scene.color_plus,
                   'rgb_hsv_convert_options',
                   expand=True)
+        row2 = col.row(align=True)
+        row2.scale_y = .95
+        row2.enabled = not disable_ui
+        row2.prop(context.scene.color_plus, 'palette_sort', text='')
+        row2.prop(context.scene.color_plus, 'palette_min_count')
 
         col = row.column(align=True)
         col.enabled = not disable_ui
@@ -332,133 +390,153 @@ class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
             "color_plus.convert_to_vertex_group",
             icon='GROUP_VERTEX', text=""
         )
+        col.operator_menu_enum(
+            "color_plus.remap_colors", "source",
+            icon='ARROW_LEFTRIGHT', text=""
+        )
 
 
-class COLORPLUS_PT_custom_palette(PanelInfo, Panel):
-    bl_label = 'Customizable Palette'
-    bl_parent_id = 'COLORPLUS_PT_ui'
+class COLORPLUS_UL_scene_palette(UIList):
+    def draw_item(self, _context, layout, _data, item, _icon,
+                  _active_data, _active_propname, _index=0, _flt_flag=0):
+        row = layout.row()
+        row.scale_x = 0.325
+        row.prop(item, 'color')
+
+        split = layout.split(factor=.55)
+        split.label(text=item.name)
+        split.label(text=f"{item.count} ({item.object_count} ob)")
 
-    @classmethod
-    def poll(cls, context):
-        return context.mode in {'EDIT_MESH', 'PAINT_VERTEX'}
+
+class COLORPLUS_PT_scene_palette(PanelInfo, Panel):
+    bl_label = 'Scene Palette'
+    bl_parent_id = 'COLORPLUS_PT_ui'
+    bl_options = {'DEFAULT_CLOSED'}
 
     def draw(self, context):
         color_plus = context.scene.color_plus
         layout = self.layout
 
-        col = layout.column()
-        COLORPLUS_PT_presets.draw_menu( # pylint: disable=E1120
-            col, text="Custom Palette Presets"
-        )
-
-        # TODO: Custom palette I/O handling
-        #row = col.row(align=True)
-        #row.enabled = False
-        #row.operator(
-        #   "color_plus.apply_attribute_shading",
-        #   text='Import', icon='IMPORT'
-        #)
-        #row.operator(
-        #    "color_plus.apply_attribute_shading",
-        #    text='Export', icon='EXPORT'
-        #)
-
         col = layout.column(align=True)
+        col.scale_y = 1.2
+        col.operator("color_plus.refresh_scene_palette",
+                     text='Refresh Scene Palette', icon='FILE_REFRESH')
 
-        row = col.row(align=True)
-        row.prop(color_plus, 'custom_apply_option', expand=True)
-
-        col.separator(factor=.2)
-
-        split = col.split(align=True)
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_1')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_1'
+        col = layout.column(align=True)
+        col.prop(color_plus, 'scene_palette_source', expand=True)
+        if color_plus.scene_palette_source == 'COLLECTION':
+            col.prop(color_plus, 'scene_palette_collection', text='')
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_2')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_2'
+        row = layout.row()
+        col = row.column(align=True)
+        col.template_list("COLORPLUS_UL_scene_palette",
+                          "",
+                          context.scene,
+                          "color_plus_palette",
+                          context.scene,
+                          "color_plus_palette_active",
+                          rows=4)
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_3')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_3'
+        col = row.column(align=True)
+        col.operator(
+            "color_plus.select_scene_palette_objects",
+            icon='RESTRICT_SELECT_OFF', text=""
+        )
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_4')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_4'
 
-        col = layout.column(align=True)
+class COLORPLUS_UL_swatches(UIList):
+    def draw_item(self, _context, layout, _data, item, _icon,
+                  _active_data, _active_propname, index=0, _flt_flag=0):
+        row = layout.row(align=True)
+        row.prop(item, 'color')
+        row.operator("color_plus.custom_color_apply",
+                     text="", icon='CHECKMARK').index = index
 
-        split = col.split(align=True)
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_5')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_5'
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_6')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_6'
+class COLORPLUS_MT_palettes(Menu):
+    bl_label = "Palettes"
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_7')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_7'
+    def draw(self, context):
+        layout = self.layout
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_8')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_8'
+        # NOTE: Entries come from the palette index,
+        # files are only read when they are loaded
+        entries = get_palette_entries()
+        for entry in entries:
+            layout.operator(
+                "color_plus.load_palette", text=entry.name
+            ).filepath = entry.filepath
+        if not entries:
+            layout.label(text="No Saved Palettes")
+
+        layout.separator()
+        layout.operator(
+            "color_plus.load_palette", text="Import...", icon='IMPORT'
+        ).filepath = ""
+        layout.operator(
+            "color_plus.palette_from_image", text="From Image...",
+            icon='IMAGE_DATA'
+        )
+        layout.operator(
+            "wm.path_open", text="Open Palette Folder", icon='FILE_FOLDER'
+        ).filepath = get_palette_directory()
 
-        col = layout.column(align=True)
 
-        split = col.split(align=True)
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_9')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_9'
+class COLORPLUS_PT_custom_palette(PanelInfo, Panel):
+    bl_label = 'Customizable Palette'
+    bl_parent_id = 'COLORPLUS_PT_ui'
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_10')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_10'
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {'EDIT_MESH', 'PAINT_VERTEX'}
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_11')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_11'
+    def draw(self, context):
+        color_plus = context.scene.color_plus
+        layout = self.layout
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_12')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_12'
+        row = layout.row(align=True)
+        row.menu(
+            "COLORPLUS_MT_palettes", text=color_plus.custom_palette_name,
+            icon='COLOR'
+        )
+        row.operator("color_plus.save_palette", text="", icon='FILE_TICK')
+        row.operator("color_plus.export_palette", text="", icon='EXPORT')
 
         col = layout.column(align=True)
 
-        split = col.split(align=True)
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_13')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_13'
-
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_14')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_14'
+        row = col.row(align=True)
+        row.prop(color_plus, 'custom_apply_option', expand=True)
+        if color_plus.custom_apply_option != 'apply_to_col':
+            COLORPLUS_PT_ui.draw_blend_mode(col, color_plus)
+
+        swatches = context.scene.color_plus_swatches
+        if not len(swatches):
+            layout.operator(
+                "color_plus.reset_custom_palette",
+                text="Add Default Palette", icon='ADD'
+            )
+            return
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_15')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_15'
+        # NOTE: Grid lists only draw the visible rows,
+        # so large palettes don't slow down the sidebar
+        row = layout.row()
+        row.template_list("COLORPLUS_UL_swatches",
+                          "",
+                          context.scene,
+                          "color_plus_swatches",
+                          context.scene,
+                          "color_plus_swatches_active",
+                          type='GRID',
+                          columns=4,
+                          rows=4)
 
-        row = split.row(align=True)
-        row.prop(color_plus, 'color_custom_16')
-        split.operator("color_plus.custom_color_apply",
-                       icon='CHECKMARK').custom_color_name = 'color_custom_16'
+        col = row.column(align=True)
+        col.operator("color_plus.add_swatch", icon='ADD', text="")
+        col.operator("color_plus.remove_swatch", icon='REMOVE', text="")
+        col.separator()
+        col.operator(
+            "color_plus.reset_custom_palette", icon='LOOP_BACK', text=""
+        )
 
 
 class COLORPLUS_PT_bake_to_vertex_color(PanelInfo, Panel):
@@ -470,6 +548,18 @@ class COLORPLUS_PT_bake_to_vertex_color(PanelInfo, Panel):
         layout = self.layout
 
         scene = context.scene
+        color_plus = scene.color_plus
+
+        # Sample an existing image directly, no bake needed
+        box = layout.box()
+        col = box.column()
+        col.label(text="Sample Image through UVs", icon='IMAGE_DATA')
+        col.template_ID(color_plus, 'sample_image', open='image.open')
+        col.prop(color_plus, 'sample_supersampling')
+        col.prop(color_plus, 'sample_selection_only')
+        col.operator(
+            "color_plus.sample_image_colors", icon='UV'
+        ).selection_only = color_plus.sample_selection_only
 
         # TODO: Validate latest build
         if not 'bakeToVertexColor_1_0_8' in context.preferences.addons:
@@ -551,10 +641,12 @@ class COLORPLUS_PT_color_generation(PanelInfo, Panel):
         col = layout.column(align=True)
         col.scale_y = 1.3
 
-        if color_plus.generate != 'dirty_color':
-            col.operator('color_plus.generate_color', icon='GROUP_VCOL')
-        else:
+        if color_plus.generate == 'dirty_color':
             col.operator('color_plus.dirty_vertex_color', icon='GROUP_VCOL')
+        elif color_plus.generate == 'gradient':
+            col.operator('color_plus.gradient_color', icon='GROUP_VCOL')
+        else:
+            col.operator('color_plus.generate_color', icon='GROUP_VCOL')
 
         row = col.row(align=True)
         row.scale_y = .8
@@ -698,8 +790,13 @@ class COLORPLUS_MT_pie_menu(Menu):
 classes = (
     COLORPLUS_PT_ui,
     COLORPLUS_PT_apply,
+    COLORPLUS_PT_statistics,
     COLORPLUS_UL_items,
     COLORPLUS_PT_palette_outliner,
+    COLORPLUS_UL_scene_palette,
+    COLORPLUS_PT_scene_palette,
+    COLORPLUS_UL_swatches,
+    COLORPLUS_MT_palettes,
     COLORPLUS_PT_custom_palette,
     COLORPLUS_PT_color_generation,
     COLORPLUS_PT_bake_to_vertex_color,
@@ -713,6 +810,9 @@ def register():
 def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
+    if bpy.app.timers.is_registered(save_indices):
+        bpy.app.timers.unregister(save_indices)
+        save_indices()
 
 
 # ##### BEGIN GPL LICENSE BLOCK #####